@@ -1,76 +1,2306 @@
 import tkinter as tk
+import tkinter.font as tkfont
 import time
+import os
+import sys
+import traceback
+import argparse
+import math
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 import json
+import base64
+import hashlib
+import gzip
+import struct
 import socket
-import qrcode
-from PIL import Image, ImageTk
+import queue
+import re
+import heapq
+import itertools
+import bisect
+import contextlib
 import io
-import winsound
+import array
+import wave
+import shutil
+import subprocess
+import sqlite3
+from urllib.parse import urlsplit, parse_qs, unquote
 
-class HideAndSeekApp:
-    def __init__(self, root):
+DEFAULT_PORT = 8080
+HTTP_WORKERS = 32
+HTTP_MAX_CONNECTIONS = 256      # rooms x phones (and spectators) per room; see --max-connections
+HTTP_REQUEST_TIMEOUT = 10.0
+HTTP_IDLE_TIMEOUT = 15.0
+HTTP_MAX_BODY = 64 * 1024
+SSE_HEARTBEAT = 15.0
+SPECTATOR_MAX = 512             # spectator streams per room
+SPECTATOR_MAX_LAG = 10.0        # seconds a spectator may leave a frame unread
+SPECTATOR_RETRY = 0.05          # while any spectator is backed up
+SPECTATOR_POLL = 1.0            # otherwise
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+WS_PING_INTERVAL = 15.0
+WS_MAX_MESSAGE = 64 * 1024
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+# ------------- METRICS -------------
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self.lock:
+            values = list(self.values.items())
+        for label_values, value in values:
+            yield f"{self.name}{format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. observe() is a bisect and three additions
+    under a lock, cheap enough to leave on for every request.
+    """
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.series = {}    # label values -> [bucket counts..., +Inf, sum, count]
+
+    def observe(self, value, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * (len(self.buckets) + 3)
+            series[i] += 1      # index len(buckets) counts only toward +Inf
+            series[-2] += value
+            series[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self.lock:
+            series = [(k, list(v)) for k, v in self.series.items()]
+        for label_values, counts in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = format_labels(self.labels + ("le",), label_values + (le,))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {counts[-2]}"
+            yield f"{self.name}_count{labels} {counts[-1]}"
+
+
+class Gauge:
+    """A value read from `callback` at scrape time, so it costs nothing in between."""
+
+    def __init__(self, name, help_text, callback):
+        self.name = name
+        self.help_text = help_text
+        self.callback = callback
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {self.callback()}"
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = (f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, metric):
+        # Re-registering a name (e.g. a second window) replaces the old one
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+HTTP_REQUESTS = METRICS.add(Counter(
+    "hideandseek_http_requests_total", "HTTP requests by route and status.",
+    ("method", "route", "status")
+))
+HTTP_LATENCY = METRICS.add(Histogram(
+    "hideandseek_http_request_seconds",
+    "Time to answer an HTTP request (streams and WebSockets excluded).",
+    ("method", "route")
+))
+STATE_SERIALIZE = METRICS.add(Histogram(
+    "hideandseek_state_serialize_seconds", "Time spent encoding /state responses as JSON."
+))
+ACTIONS_APPLIED = METRICS.add(Counter(
+    "hideandseek_actions_total", "Control actions applied, by type.", ("action",)
+))
+TICK_LATENESS = METRICS.add(Histogram(
+    "hideandseek_timer_tick_lateness_seconds",
+    "How late timer ticks run after their deadline.", ("loop",)
+))
+UI_CALLS = METRICS.add(Histogram(
+    "hideandseek_ui_call_seconds", "Time spent on the Tk thread in display work.", ("call",)
+))
+SPECTATOR_FRAMES = METRICS.add(Counter(
+    "hideandseek_spectator_frames_total",
+    "State frames for spectators: pushed, or skipped for a newer one.", ("outcome",)
+))
+SPECTATOR_DROPS = METRICS.add(Counter(
+    "hideandseek_spectator_drops_total", "Spectators disconnected for falling too far behind."
+))
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer that gives each connection a worker thread from a pool, so
+    one slow phone can't stall everyone else's requests. Connections are
+    kept alive between requests, so the pool grows on demand up to
+    max_connections; past that, new connections get an immediate 503
+    instead of waiting behind phones that are merely idle.
+    """
+
+    # Listen backlog; the default of 5 drops SYNs when many phones load
+    # the page at once, costing them a one-second retransmit
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, max_workers=HTTP_WORKERS,
+                 max_connections=HTTP_MAX_CONNECTIONS, request_timeout=HTTP_REQUEST_TIMEOUT,
+                 idle_timeout=HTTP_IDLE_TIMEOUT):
+        self.request_timeout = request_timeout
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._open = 0
+        self._idle = 0
+        self._detached = set()
+        self._pending = queue.Queue()
+        self._workers = []
+        super().__init__(server_address, handler_class)
+        for _ in range(max_workers):
+            self._start_worker()
+
+    def _start_worker(self):
+        worker = threading.Thread(
+            target=self._worker, name=f"http-worker-{len(self._workers)}", daemon=True
+        )
+        self._workers.append(worker)
+        self._idle += 1
+        worker.start()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            if self._open >= self.max_connections:
+                self.reject(request)
+                return
+            self._open += 1
+            if self._idle == 0:
+                self._start_worker()
+            self._idle -= 1
+        self._pending.put((request, client_address))
+
+    def reject(self, request):
+        try:
+            request.setblocking(False)
+            request.send(b"HTTP/1.1 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                         b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def open_connections(self):
+        return self._open
+
+    def detach(self, request):
+        """
+        Leave `request` open when its handler returns; whoever detached
+        it now owns the socket. The worker itself is freed as usual.
+        """
+        with self._lock:
+            self._detached.add(request)
+
+    def _worker(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._lock:
+                    detached = request in self._detached
+                    self._detached.discard(request)
+                if not detached:
+                    self.shutdown_request(request)
+                with self._lock:
+                    self._open -= 1
+                    self._idle += 1
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._workers:
+            self._pending.put(None)
+
+
+# ------------- WEBSOCKET -------------
+
+WS_OP_CONTINUATION = 0x0
+WS_OP_TEXT = 0x1
+WS_OP_BINARY = 0x2
+WS_OP_CLOSE = 0x8
+WS_OP_PING = 0x9
+WS_OP_PONG = 0xA
+
+
+def websocket_accept_key(key):
+    digest = hashlib.sha1((key + WS_GUID).encode()).digest()
+    return base64.b64encode(digest).decode()
+
+
+def encode_ws_frame(opcode, payload=b""):
+    """Build a single unmasked, unfragmented server-to-client frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def state_delta(old, new):
+    """
+    Compact difference between two get_state() snapshots: only the
+    player fields, seeker and timer values that actually changed.
+    """
+    delta = {}
+    if len(old['players']) != len(new['players']):
+        delta['players'] = new['players']
+    else:
+        changes = {}
+        for i, (before, after) in enumerate(zip(old['players'], new['players'])):
+            fields = {k: v for k, v in after.items() if before.get(k) != v}
+            if fields:
+                changes[str(i)] = fields
+        if changes:
+            delta['player_changes'] = changes
+    for key in ('seeker_index', 'timer_running', 'timer'):
+        if old[key] != new[key]:
+            delta[key] = new[key]
+    if delta:
+        delta['version'] = new['version']
+    return delta
+
+
+class WebSocket:
+    """
+    Minimal RFC 6455 server-side connection on top of a raw socket. Reads
+    go straight to the socket (not the handler's buffered rfile) so a read
+    timeout can be used to send keepalive pings without losing data.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.settimeout(WS_PING_INTERVAL)
+        self._buffer = bytearray()
+        self._send_lock = threading.Lock()
+        self._last_seen = time.monotonic()
+        self.closed = False
+
+    def _fill(self, size):
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(4096, size - len(self._buffer)))
+            if not chunk:
+                raise ConnectionResetError("WebSocket peer went away")
+            self._buffer += chunk
+
+    def _read_frame(self):
+        # Parse from the buffer without consuming it until the whole frame
+        # is there, so a timeout mid-frame can simply be retried.
+        self._fill(2)
+        b1, b2 = self._buffer[0], self._buffer[1]
+        offset = 2
+        length = b2 & 0x7F
+        if length == 126:
+            self._fill(offset + 2)
+            length = struct.unpack_from("!H", self._buffer, offset)[0]
+            offset += 2
+        elif length == 127:
+            self._fill(offset + 8)
+            length = struct.unpack_from("!Q", self._buffer, offset)[0]
+            offset += 8
+        if length > WS_MAX_MESSAGE:
+            raise ValueError("WebSocket frame too large")
+        if not b2 & 0x80:
+            raise ValueError("client frames must be masked")
+
+        self._fill(offset + 4 + length)
+        mask = self._buffer[offset:offset + 4]
+        offset += 4
+        payload = bytes(
+            b ^ mask[i % 4] for i, b in enumerate(self._buffer[offset:offset + length])
+        )
+        del self._buffer[:offset + length]
+        return bool(b1 & 0x80), b1 & 0x0F, payload
+
+    def receive(self):
+        """
+        Return the next text message, or None once the peer closes.
+        Control frames are answered here; silent peers are pinged and
+        dropped after two missed intervals.
+        """
+        fragments = []
+        while True:
+            try:
+                fin, opcode, payload = self._read_frame()
+            except socket.timeout:
+                if time.monotonic() - self._last_seen > 2 * WS_PING_INTERVAL:
+                    return None
+                self.send_frame(encode_ws_frame(WS_OP_PING))
+                continue
+
+            self._last_seen = time.monotonic()
+            if opcode == WS_OP_CLOSE:
+                self.send_frame(encode_ws_frame(WS_OP_CLOSE, payload[:2]))
+                return None
+            if opcode == WS_OP_PING:
+                self.send_frame(encode_ws_frame(WS_OP_PONG, payload))
+                continue
+            if opcode == WS_OP_PONG:
+                continue
+
+            fragments.append(payload)
+            if sum(len(f) for f in fragments) > WS_MAX_MESSAGE:
+                raise ValueError("WebSocket message too large")
+            if fin:
+                return b"".join(fragments).decode("utf-8")
+
+    def send_frame(self, frame):
+        """Send an encoded frame; returns False if the connection is dead."""
+        if self.closed:
+            return False
+        try:
+            with self._send_lock:
+                self.sock.sendall(frame)
+            return True
+        except OSError:
+            self.close()
+            return False
+
+    def send_json(self, message):
+        return self.send_frame(encode_ws_frame(WS_OP_TEXT, json.dumps(message).encode()))
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class WebSocketHub:
+    """
+    Tracks connected controllers and broadcasts one encoded delta frame
+    to all of them whenever the game state changes.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.last_state = None
+        self.thread = None
+
+    def snapshot(self):
+        return self.engine.get_state()
+
+    def add(self, ws):
+        with self.lock:
+            if not self.clients:
+                self.last_state = self.snapshot()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="ws-broadcast", daemon=True)
+                self.thread.start()
+            # Deltas are relative to last_state, so that's what a newcomer starts from
+            ws.send_json({'type': 'state', 'state': self.last_state})
+            self.clients.add(ws)
+
+    def remove(self, ws):
+        with self.lock:
+            self.clients.discard(ws)
+
+    def _run(self):
+        serial = None
+        while True:
+            _, serial = self.engine.wait_for_state_change(serial, WS_PING_INTERVAL)
+            with self.lock:
+                if not self.clients:
+                    # Idle rooms shouldn't keep a thread; add() starts a new one
+                    self.thread = None
+                    return
+                state = self.snapshot()
+                delta = state_delta(self.last_state, state)
+                if not delta:
+                    continue
+                self.last_state = state
+                delta['type'] = 'delta'
+                frame = encode_ws_frame(WS_OP_TEXT, json.dumps(delta).encode())
+                for ws in list(self.clients):
+                    if not ws.send_frame(frame):
+                        self.clients.discard(ws)
+
+
+# ------------- SPECTATORS -------------
+
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+
+class Spectator:
+    """
+    One read-only event stream, written without blocking. Every frame is
+    a full state, so it holds at most the frame being sent and the
+    newest one waiting behind it; anything in between is skipped.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.sending = memoryview(b"")
+        self.waiting = None
+        self.last_progress = time.monotonic()
+
+    @property
+    def backlogged(self):
+        return bool(self.sending)
+
+    def push(self, frame):
+        if not self.sending:
+            self.sending = memoryview(frame)
+            self.last_progress = time.monotonic()
+            return
+        if self.waiting is not None:
+            SPECTATOR_FRAMES.inc("skipped")
+        self.waiting = frame
+
+    def flush(self, now):
+        """Send what the socket will take; False once this spectator should go."""
+        while self.sending:
+            try:
+                sent = self.sock.send(self.sending)
+            except BlockingIOError:
+                if now - self.last_progress > SPECTATOR_MAX_LAG:
+                    SPECTATOR_DROPS.inc()
+                    return False
+                return True
+            except OSError:
+                return False
+            self.last_progress = now
+            self.sending = self.sending[sent:]
+            if not self.sending and self.waiting is not None:
+                self.sending = memoryview(self.waiting)
+                self.waiting = None
+        return True
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class SpectatorHub:
+    """
+    Fans each state change out to a room's spectator screens from one
+    thread: the frame is built once per state version and every socket
+    is written without blocking, so a slow screen costs nothing but
+    its own frames. Spectators never send anything, so their sockets
+    are taken off the HTTP workers entirely.
+    """
+
+    def __init__(self, engine, max_spectators=SPECTATOR_MAX):
+        self.engine = engine
+        self.max_spectators = max_spectators
+        self.spectators = []
+        self.lock = threading.Lock()
+        self.thread = None
+        self.frame_version = None
+        self.frame = None
+
+    def __len__(self):
+        return len(self.spectators)
+
+    def current_frame(self):
+        version, body = self.engine.encoded_state()
+        if version != self.frame_version:
+            self.frame_version = version
+            self.frame = b"data: " + body + b"\n\n"
+        return self.frame
+
+    def add(self, sock):
+        """Start streaming to `sock`; False if the room already has all the spectators it takes."""
+        with self.lock:
+            if len(self.spectators) >= self.max_spectators:
+                return False
+            spectator = Spectator(sock)
+            spectator.push(self.current_frame())
+            if not spectator.flush(time.monotonic()):
+                spectator.close()
+                return True
+            self.spectators.append(spectator)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="spectators", daemon=True)
+                self.thread.start()
+            return True
+
+    def _run(self):
+        serial = None
+        next_heartbeat = time.monotonic() + SSE_HEARTBEAT
+        while True:
+            with self.lock:
+                backlogged = any(s.backlogged for s in self.spectators)
+            _, serial = self.engine.wait_for_state_change(
+                serial, SPECTATOR_RETRY if backlogged else SPECTATOR_POLL
+            )
+            now = time.monotonic()
+            with self.lock:
+                if not self.spectators:
+                    # Like the WebSocket hub: no idle thread per quiet room
+                    self.thread = None
+                    return
+                version = self.frame_version
+                frame = self.current_frame()
+                if self.frame_version != version:
+                    SPECTATOR_FRAMES.inc("pushed", amount=len(self.spectators))
+                heartbeat = now >= next_heartbeat
+                if heartbeat:
+                    next_heartbeat = now + SSE_HEARTBEAT
+                live = []
+                for spectator in self.spectators:
+                    if self.frame_version != version:
+                        spectator.push(frame)
+                    elif heartbeat and not spectator.backlogged:
+                        spectator.push(SSE_KEEPALIVE)
+                    if spectator.flush(now):
+                        live.append(spectator)
+                    else:
+                        spectator.close()
+                self.spectators = live
+
+
+# ------------- STATIC ASSETS -------------
+
+class StaticAsset:
+    """
+    A response body encoded once at startup, kept in identity and gzip
+    form, each with its own content-hash ETag.
+    """
+
+    def __init__(self, body, content_type, cache_control):
+        self.identity = body.encode()
+        self.gzip = gzip.compress(self.identity, compresslevel=9, mtime=0)
+        self.etag = '"' + hashlib.sha1(self.identity).hexdigest()[:16] + '"'
+        self.gzip_etag = self.etag[:-1] + '-gz"'
+        self.content_type = content_type
+        self.cache_control = cache_control
+
+    @property
+    def version(self):
+        return self.etag.strip('"')
+
+
+def accepts_gzip(accept_encoding):
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def build_static_assets():
+    # CSS/JS URLs carry their content hash, so browsers may keep them
+    # forever; the page itself is revalidated (a cheap 304) every load.
+    clock_js = StaticAsset(CLOCK_JS, 'application/javascript; charset=utf-8', STATIC_CACHE_CONTROL)
+    css = StaticAsset(CONTROL_CSS, 'text/css; charset=utf-8', STATIC_CACHE_CONTROL)
+    js = StaticAsset(CONTROL_JS, 'application/javascript; charset=utf-8', STATIC_CACHE_CONTROL)
+    page = (CONTROL_PAGE
+            .replace('{css_version}', css.version)
+            .replace('{clock_version}', clock_js.version)
+            .replace('{js_version}', js.version))
+    watch_css = StaticAsset(WATCH_CSS, 'text/css; charset=utf-8', STATIC_CACHE_CONTROL)
+    watch_js = StaticAsset(WATCH_JS.replace('{wide_layout_max}', str(WIDE_LAYOUT_MAX)),
+                           'application/javascript; charset=utf-8', STATIC_CACHE_CONTROL)
+    watch_page = (WATCH_PAGE
+                  .replace('{css_version}', watch_css.version)
+                  .replace('{clock_version}', clock_js.version)
+                  .replace('{js_version}', watch_js.version))
+    return {
+        '/static/clock.js': clock_js,
+        '/': StaticAsset(page, 'text/html; charset=utf-8', 'no-cache'),
+        '/static/control.css': css,
+        '/static/control.js': js,
+        '/watch': StaticAsset(watch_page, 'text/html; charset=utf-8', 'no-cache'),
+        '/static/watch.css': watch_css,
+        '/static/watch.js': watch_js,
+    }
+
+
+# ------------- GAME ENGINE -------------
+
+HIDING_SECONDS = 60
+SEEKING_SECONDS = 300
+FOUND_POINTS = 3
+HIDING_WARNING_SECONDS = 5
+SEEKING_WARNING_SECONDS = 10
+
+ACTIONS = (
+    'set_seeker', 'add_point', 'player_found', 'reset_scores',
+    'start_round', 'stop_timer', 'update_name', 'add_player', 'remove_player'
+)
+
+ENCODED_DELTA_CACHE = 64     # distinct ?since= values cached per version
+MIN_PLAYERS = 2
+MAX_PLAYERS = 40
+PLAYER_COLORS = [
+    "#6B9BD1", "#7DB88A", "#D17B7B", "#C9A75A", "#9C7BC4",
+    "#5FB3B3", "#D1905B", "#B86B9B", "#8A9B6B", "#6B7BD1"
+]
+
+DEFAULT_PLAYERS = [
+    {"name": "Player 1", "color": "#6B9BD1", "score": 0, "found": False},
+    {"name": "Player 2", "color": "#7DB88A", "score": 0, "found": False},
+    {"name": "Player 3", "color": "#D17B7B", "score": 0, "found": False}
+]
+
+
+def new_round_stats():
+    return {'points': 0, 'minute_points': 0, 'found_after': None}
+
+
+class GameEngine:
+    """
+    The game rules and state, with no Tk or HTTP involved. Time comes from
+    an injectable clock, and every change is announced to subscribers as
+    callback(event, data), so the display and the control server simply
+    follow along. Safe to call from any thread.
+
+    Events: round_started, seeking_started, minute, warning, timer,
+    round_complete, timer_stopped, round_over, score, name, found,
+    seeker, scores_reset, player_added, player_removed, round_finished.
+    """
+
+    def __init__(self, players=None, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.subscribers = []
+
+        self.players = [dict(p) for p in (players or DEFAULT_PLAYERS)]
+        self.seeker_index = 0
+        self.first_found_index = None
+
+        # Timer state
+        self.timer_running = False
+        self.timer_phase = None       # "hiding" or "seeking"
+        self.phase_start_time = 0
+        self.last_minute_awarded = 0
+        self.last_warning = None
+        self.last_timer_key = None
+
+        # Per-player stats of the round in progress (parallel to players),
+        # reported in the round_finished event
+        self.round_start_time = None
+        self.round_stats = [new_round_stats() for _ in self.players]
+
+        # Every mutation bumps state_version and stamps the parts it touched,
+        # so /state can answer with 304s and ?since=N deltas
+        self.state_cond = threading.Condition(self.lock)
+        self.state_version = 0
+        # Versions restart with every engine (e.g. after journal recovery);
+        # the epoch tells a client's version apart from this engine's
+        self.epoch = os.urandom(4).hex()
+        self.player_versions = [0] * len(self.players)
+        self.seeker_version = 0
+        self.timer_version = 0
+        self.roster_version = 0     # players joined or left; indices moved
+
+        # Set by GameJournal.attach() to persist every change
+        self.journal = None
+        # True while the journal re-applies old actions, which aren't counted again
+        self.replaying = False
+
+        # Encoded /state bodies for the current state_version, shared by
+        # every poller; dropped whenever the version moves
+        self.encoded_version = None
+        self.encoded_full = None
+        self.encoded_deltas = {}
+
+    # ------------- EVENTS -------------
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def emit(self, event, **data):
+        for callback in list(self.subscribers):
+            callback(event, data)
+
+    def changed(self, players=(), seeker=False, timer=False, roster=False):
+        with self.state_cond:
+            self.state_version += 1
+            for i in players:
+                self.player_versions[i] = self.state_version
+            if seeker:
+                self.seeker_version = self.state_version
+            if timer:
+                self.timer_version = self.state_version
+            if roster:
+                self.roster_version = self.state_version
+            self.state_cond.notify_all()
+
+    def record(self, op, data=None):
+        if self.journal is not None:
+            self.journal.append(op, data)
+
+    # ------------- ROUND / TIMER -------------
+
+    def start_round(self):
+        with self.lock:
+            if self.timer_running:
+                return
+
+            # Reset all found flags
+            for player in self.players:
+                player["found"] = False
+            self.first_found_index = None
+
+            self.timer_running = True
+            self.timer_phase = "hiding"
+            self.phase_start_time = self.clock()
+            self.round_start_time = self.phase_start_time
+            self.round_stats = [new_round_stats() for _ in self.players]
+            self.last_minute_awarded = 0
+            self.last_warning = None
+
+            self.changed(players=range(len(self.players)))
+            self.emit("round_started")
+            self.refresh_timer()
+
+    def stop_timer(self):
+        with self.lock:
+            self.halt_timer()
+            self.emit("timer_stopped")
+            self.finish_round("stopped")
+
+    def halt_timer(self):
+        self.timer_running = False
+        self.timer_phase = None
+        self.refresh_timer()
+
+    def tick(self):
+        """
+        Advance the round to the current clock time. A late tick catches
+        up: a phase change it slept through still happens at its
+        deadline, and every minute award it missed fires exactly once.
+        """
+        with self.lock:
+            if not self.timer_running:
+                return
+
+            now = self.clock()
+            version, phase = self.state_version, self.timer_phase
+
+            if self.timer_phase == "hiding":
+                if now - self.phase_start_time >= HIDING_SECONDS:
+                    # Seeking starts exactly at the hiding deadline, however
+                    # late this tick is, so the phases never drift
+                    self.timer_phase = "seeking"
+                    self.phase_start_time += HIDING_SECONDS
+                    self.last_minute_awarded = 0
+                    self.last_warning = None
+                    self.emit("seeking_started")
+                else:
+                    elapsed = now - self.phase_start_time
+                    self.check_warning(HIDING_SECONDS - int(elapsed), HIDING_WARNING_SECONDS)
+
+            if self.timer_phase == "seeking":
+                elapsed = now - self.phase_start_time
+                current_minute = min(int(elapsed // 60), SEEKING_SECONDS // 60)
+                for minute in range(self.last_minute_awarded + 1, current_minute + 1):
+                    self.award_hider_points()
+                    self.last_minute_awarded = minute
+                    self.emit("minute", minute=minute)
+
+                if elapsed >= SEEKING_SECONDS:
+                    self.halt_timer()
+                    self.emit("round_complete")
+                    self.finish_round("complete")
+                    self.record("tick")
+                    return
+
+                self.check_warning(SEEKING_SECONDS - int(elapsed), SEEKING_WARNING_SECONDS)
+
+            # Journal ticks that changed the game (phase change, minute
+            # award), not the ones that only moved the countdown
+            if self.state_version != version or self.timer_phase != phase:
+                self.record("tick")
+            self.refresh_timer()
+
+    def next_deadline(self):
+        """
+        Clock time at which the displayed countdown next changes, or None
+        while idle. Phase ends, minute awards and warnings all fall on
+        whole seconds of a phase, so nothing can be due before this.
+        """
+        with self.lock:
+            if not self.timer_running:
+                return None
+            elapsed = self.clock() - self.phase_start_time
+            return self.phase_start_time + math.floor(elapsed) + 1
+
+    def check_warning(self, remaining, window):
+        # One warning per displayed second inside the final `window` seconds
+        if 0 < remaining <= window and remaining != self.last_warning:
+            self.last_warning = remaining
+            self.emit("warning", phase=self.timer_phase, remaining=remaining)
+
+    def refresh_timer(self):
+        info = self.get_timer_info()
+        key = (info['phase'], info['time'])
+        if key != self.last_timer_key:
+            # Clients count down from the phase deadline themselves, so
+            # only a new phase is a state change; the display still
+            # gets an event every second
+            if self.last_timer_key is None or key[0] != self.last_timer_key[0]:
+                self.changed(timer=True)
+            self.last_timer_key = key
+            self.emit("timer", timer=info)
+
+    def end_round(self):
+        """Stop the round and hand the seeker role to the first player found."""
+        with self.lock:
+            self.halt_timer()
+            self.finish_round("ended")
+            next_seeker = self.first_found_index
+            self.emit("round_over", next_seeker=next_seeker)
+            if next_seeker is not None:
+                self.set_seeker(next_seeker, reason="rotation")
+            self.record("end_round")
+
+    def finish_round(self, outcome):
+        """Report the round that just ended, once, as a round_finished event."""
+        if self.round_start_time is None:
+            return
+        record = {
+            'outcome': outcome,
+            'duration': round(self.clock() - self.round_start_time, 1),
+            'seeker': self.players[self.seeker_index]['name'],
+            'players': [
+                {
+                    'name': player['name'],
+                    'role': 'seeker' if i == self.seeker_index else 'hider',
+                    **stats
+                }
+                for i, (player, stats) in enumerate(zip(self.players, self.round_stats))
+            ]
+        }
+        self.round_start_time = None
+        self.emit("round_finished", record=record)
+
+    # ------------- SCORING -------------
+
+    def award_hider_points(self):
+        with self.lock:
+            hiders = [
+                i for i, player in enumerate(self.players)
+                if i != self.seeker_index and not player["found"]
+            ]
+            # One version bump for the whole award, one event per player
+            for i in hiders:
+                self.players[i]["score"] += 1
+                self.round_stats[i]["points"] += 1
+                self.round_stats[i]["minute_points"] += 1
+            self.changed(players=hiders)
+            for i in hiders:
+                self.emit("score", index=i, score=self.players[i]["score"])
+
+    def add_point(self, index, points=1):
+        with self.lock:
+            self.players[index]["score"] += points
+            self.round_stats[index]["points"] += points
+            self.changed(players=[index])
+            self.emit("score", index=index, score=self.players[index]["score"])
+
+    def reset_scores(self):
+        with self.lock:
+            scored = [i for i, player in enumerate(self.players) if player["score"]]
+            for i in scored:
+                self.players[i]["score"] = 0
+            self.changed(players=scored)
+            for i in scored:
+                self.emit("score", index=i, score=0)
+            self.emit("scores_reset")
+
+    def update_name(self, index, name):
+        with self.lock:
+            self.players[index]["name"] = name
+            self.changed(players=[index])
+            self.emit("name", index=index, name=name)
+
+    def set_seeker(self, index, reason="manual"):
+        with self.lock:
+            if self.seeker_index == index:
+                return
+            self.seeker_index = index
+            self.changed(seeker=True)
+            self.emit("seeker", index=index, reason=reason)
+
+    def mark_player_found(self, index):
+        with self.lock:
+            if index == self.seeker_index or self.players[index]["found"]:
+                return
+
+            self.players[index]["found"] = True
+            if self.round_start_time is not None:
+                self.round_stats[index]["found_after"] = round(self.clock() - self.round_start_time, 1)
+            if self.first_found_index is None:
+                self.first_found_index = index
+            self.changed(players=[index])
+            self.emit("found", index=index)
+
+            self.add_point(self.seeker_index, FOUND_POINTS)
+
+    # ------------- ROSTER -------------
+
+    def add_player(self, name=None):
+        with self.lock:
+            index = len(self.players)
+            self.players.append({
+                "name": name or f"Player {index + 1}",
+                "color": PLAYER_COLORS[index % len(PLAYER_COLORS)],
+                "score": 0,
+                "found": False
+            })
+            self.player_versions.append(0)
+            self.round_stats.append(new_round_stats())
+            self.changed(players=[index], roster=True)
+            self.emit("player_added", index=index)
+            return index
+
+    def remove_player(self, index):
+        """
+        Remove a player; everyone after them moves down one index. If the
+        seeker leaves, the player taking their place becomes seeker.
+        """
+        with self.lock:
+            del self.players[index]
+            del self.player_versions[index]
+            del self.round_stats[index]
+
+            if index < self.seeker_index or self.seeker_index == len(self.players):
+                self.seeker_index -= 1
+            if self.first_found_index == index:
+                self.first_found_index = None
+            elif self.first_found_index is not None and self.first_found_index > index:
+                self.first_found_index -= 1
+
+            self.changed(seeker=True, roster=True)
+            self.emit("player_removed", index=index)
+
+    # ------------- ACTIONS -------------
+
+    def validate_action(self, data, player_count=None):
+        """
+        Raise ValueError unless `data` is an action apply_action() would
+        accept: a known action naming players that exist. `player_count`
+        overrides the current count, for checking later actions in a batch.
+        """
+        if player_count is None:
+            player_count = len(self.players)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+
+        action = data.get('action')
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action: {action!r}")
+
+        index = data.get('index')
+        if action in ('set_seeker', 'add_point', 'player_found', 'update_name', 'remove_player'):
+            # bool is an int subclass, but JSON true/false isn't an index
+            if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < player_count:
+                raise ValueError(f"invalid player index: {index!r}")
+
+        if action == 'update_name' and not isinstance(data.get('name'), str):
+            raise ValueError("update_name needs a 'name' string")
+        if action == 'add_player':
+            if not isinstance(data.get('name', ''), str):
+                raise ValueError("add_player's 'name' must be a string")
+            if player_count >= MAX_PLAYERS:
+                raise ValueError(f"at most {MAX_PLAYERS} players")
+        if action == 'remove_player' and player_count <= MIN_PLAYERS:
+            raise ValueError(f"at least {MIN_PLAYERS} players are needed")
+
+    def apply_action(self, data):
+        """
+        Apply one control action as sent by the control page, either as a
+        POST body or a WebSocket message. Raises ValueError if the action
+        is unknown or refers to a player that doesn't exist.
+        """
+        self.validate_action(data)
+        with self.lock:
+            self.perform_action(data)
+            self.record("action", data)
+
+    def perform_action(self, data):
+        # apply_action() without the validation and journaling
+        action = data['action']
+        index = data.get('index')
+        if not self.replaying:
+            ACTIONS_APPLIED.inc(action)
+
+        with self.lock:
+            if action == 'set_seeker':
+                self.set_seeker(index)
+            elif action == 'add_point':
+                self.add_point(index)
+            elif action == 'player_found':
+                self.mark_player_found(index)
+            elif action == 'reset_scores':
+                self.reset_scores()
+            elif action == 'start_round':
+                self.start_round()
+            elif action == 'stop_timer':
+                self.stop_timer()
+            elif action == 'update_name':
+                self.update_name(index, data['name'])
+            elif action == 'add_player':
+                self.add_player(data.get('name'))
+            elif action == 'remove_player':
+                self.remove_player(index)
+
+    def apply_actions(self, actions):
+        """
+        Apply an ordered list of actions atomically: all of them are
+        validated before any is applied, and the lock is held throughout
+        so no reader ever sees a half-applied batch.
+        """
+        if not isinstance(actions, list):
+            raise ValueError("expected a list of actions")
+
+        with self.lock:
+            # Track the roster size so actions can name players added
+            # earlier in the same batch
+            player_count = len(self.players)
+            for i, data in enumerate(actions):
+                try:
+                    self.validate_action(data, player_count)
+                except ValueError as e:
+                    raise ValueError(f"action {i}: {e}") from None
+                if data['action'] == 'add_player':
+                    player_count += 1
+                elif data['action'] == 'remove_player':
+                    player_count -= 1
+            for data in actions:
+                self.perform_action(data)
+            self.record("actions", actions)
+
+    # ------------- STATE SNAPSHOT -------------
+
+    def get_timer_info(self):
+        with self.lock:
+            if not self.timer_running:
+                return {
+                    'running': False,
+                    'phase': None,
+                    'time': '--:--',
+                    'label': 'READY'
+                }
+
+            elapsed = self.clock() - self.phase_start_time
+            if self.timer_phase == 'hiding':
+                duration = HIDING_SECONDS
+                label = 'HIDING (1 min)'
+            else:
+                duration = SEEKING_SECONDS
+                label = 'SEEKING (5 min)'
+            remaining = max(0, duration - int(elapsed))
+            mins, secs = divmod(remaining, 60)
+            return {
+                'running': True,
+                'phase': self.timer_phase,
+                'time': f'{mins:02d}:{secs:02d}',
+                'label': label,
+                # On this engine's clock; GET /time gives its current
+                # reading so clients can count down locally
+                'deadline': round(self.phase_start_time + duration, 3),
+                'duration': duration
+            }
+
+    def timer_state(self):
+        """
+        The timer as sent to clients. A running timer's formatted time
+        is left out: the state version only moves when the phase does,
+        so it would be stale in every cached copy; clients count down
+        from the deadline instead.
+        """
+        info = self.get_timer_info()
+        if info['running']:
+            del info['time']
+        return info
+
+    def get_state(self):
+        with self.lock:
+            return {
+                'version': self.state_version,
+                'epoch': self.epoch,
+                'players': [dict(p) for p in self.players],
+                'seeker_index': self.seeker_index,
+                'timer_running': self.timer_running,
+                'timer': self.timer_state()
+            }
+
+    def get_state_since(self, since):
+        """
+        Only the parts of the state that changed after version `since`.
+        Returns None if `since` is from the future (e.g. an earlier run
+        of the app), in which case the client needs the full state.
+        """
+        with self.lock:
+            version = self.state_version
+            if since > version:
+                return None
+
+            delta = {'version': version, 'epoch': self.epoch, 'since': since}
+            if self.roster_version > since:
+                # Indices moved, so per-player changes wouldn't line up
+                delta['players'] = [dict(p) for p in self.players]
+            else:
+                changes = {
+                    str(i): dict(player)
+                    for i, player in enumerate(self.players)
+                    if self.player_versions[i] > since
+                }
+                if changes:
+                    delta['player_changes'] = changes
+            if self.seeker_version > since:
+                delta['seeker_index'] = self.seeker_index
+            if self.timer_version > since:
+                delta['timer_running'] = self.timer_running
+                delta['timer'] = self.timer_state()
+            return delta
+
+    def export_state(self, offset):
+        """
+        Everything needed to resume this game in another process, with
+        clock times converted to wall-clock times (clock() + offset).
+        """
+        with self.lock:
+            return {
+                'players': [dict(p) for p in self.players],
+                'seeker_index': self.seeker_index,
+                'first_found_index': self.first_found_index,
+                'timer_running': self.timer_running,
+                'timer_phase': self.timer_phase,
+                'phase_start': self.phase_start_time + offset,
+                'last_minute_awarded': self.last_minute_awarded,
+                'round_start': None if self.round_start_time is None else self.round_start_time + offset,
+                'round_stats': [dict(stats) for stats in self.round_stats]
+            }
+
+    def import_state(self, state, offset):
+        """Load an export_state() snapshot; `offset` as there, for this process."""
+        with self.lock:
+            self.players = [dict(p) for p in state['players']]
+            self.player_versions = [0] * len(self.players)
+            self.seeker_index = state['seeker_index']
+            self.first_found_index = state['first_found_index']
+            self.timer_running = state['timer_running']
+            self.timer_phase = state['timer_phase']
+            self.phase_start_time = state['phase_start'] - offset
+            self.last_minute_awarded = state['last_minute_awarded']
+            round_start = state.get('round_start')
+            self.round_start_time = None if round_start is None else round_start - offset
+            self.round_stats = state.get('round_stats') or [new_round_stats() for _ in self.players]
+            self.last_warning = None
+            self.last_timer_key = None
+            self.changed(seeker=True, timer=True, roster=True)
+
+    def encoded_state(self, since=None):
+        """
+        (version, JSON bytes) of get_state(), or of get_state_since(since)
+        when `since` is given and not from the future. Each is encoded at
+        most once per state version, so a poll costs the same however
+        many controllers are polling.
+        """
+        with self.lock:
+            if self.encoded_version != self.state_version:
+                self.encoded_version = self.state_version
+                self.encoded_full = None
+                self.encoded_deltas = {}
+
+            if since is not None and since <= self.state_version:
+                body = self.encoded_deltas.get(since)
+                if body is None:
+                    with STATE_SERIALIZE.time():
+                        body = json.dumps(self.get_state_since(since)).encode()
+                    if len(self.encoded_deltas) < ENCODED_DELTA_CACHE:
+                        self.encoded_deltas[since] = body
+                return self.state_version, body
+
+            if self.encoded_full is None:
+                with STATE_SERIALIZE.time():
+                    self.encoded_full = json.dumps(self.get_state()).encode()
+            return self.state_version, self.encoded_full
+
+    def wait_for_state_change(self, version, timeout):
+        """
+        Block until the state version differs from `version` or `timeout`
+        expires. Returns (changed, current_version).
+        """
+        with self.state_cond:
+            changed = self.state_cond.wait_for(
+                lambda: self.state_version != version, timeout
+            )
+            return changed, self.state_version
+
+
+# ------------- COMMAND QUEUE -------------
+
+UI_FRAME_MS = 16
+COMMAND_TIMEOUT = 5.0
+
+
+class CommandQueued(Exception):
+    """The command wasn't applied in time, but it has started and will be."""
+
+
+class PendingCommand:
+    def __init__(self, func):
+        self.func = func
+        self.done = threading.Event()
+        self.cancelled = False
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = self.func()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def wait(self, timeout):
+        if not self.done.wait(timeout):
+            raise TimeoutError("command was not applied in time")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class CommandQueue:
+    """
+    Locked hand-off from server threads to the thread that owns the game.
+    submit() queues a callable and calls `wake` once per batch; the owner
+    then drain()s everything queued so far in one go, so a burst of
+    actions costs one wake-up and one redraw. A wake that fails (Tk
+    refuses calls from other threads until its loop runs) is retried by
+    the next submit(). call() never leaves a caller guessing: a command
+    that times out is either cancelled for good or already running.
+    """
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.lock = threading.Lock()
+        self.pending = []
+        self.woken = False
+
+    def submit(self, func):
+        command = PendingCommand(func)
+        with self.lock:
+            self.pending.append(command)
+            wake, self.woken = not self.woken, True
+        if wake:
+            try:
+                self.wake()
+            except Exception:
+                with self.lock:
+                    self.woken = False
+        return command
+
+    def call(self, func, timeout):
+        """
+        Submit `func` and return its result. Raises TimeoutError if it
+        wasn't applied in time and never will be, CommandQueued if it
+        was taken by drain() and is still to finish.
+        """
+        command = self.submit(func)
+        try:
+            return command.wait(timeout)
+        except TimeoutError:
+            with self.lock:
+                if any(c is command for c in self.pending):
+                    command.cancelled = True
+                    raise
+            if command.done.is_set():
+                return command.wait(0)
+            raise CommandQueued() from None
+
+    def drain(self):
+        with self.lock:
+            self.woken = False
+            batch = [c for c in self.pending if not c.cancelled]
+            self.pending = []
+        for command in batch:
+            command.run()
+        return len(batch)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.pending)
+
+
+# ------------- JOURNAL -------------
+
+DEFAULT_DATA_DIR = "game_data"
+JOURNAL_SYNC_INTERVAL = 0.25
+JOURNAL_SYNC_LINGER = 5.0       # idle seconds before the sync thread exits
+SNAPSHOT_EVERY = 500
+
+
+class GameJournal:
+    """
+    Crash recovery for one engine. Every state-changing action (and every
+    tick that awarded points or changed phase) is appended to
+    <name>.journal as a JSON line; every SNAPSHOT_EVERY entries the whole
+    state goes to <name>.snapshot and the journal starts over, so a
+    restart never replays more than that. Appends are fsynced in batches
+    by a background thread rather than one fsync per action; the thread
+    only runs while there is something to sync.
+    """
+
+    def __init__(self, directory, name="main"):
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, name + ".journal")
+        self.snapshot_path = os.path.join(directory, name + ".snapshot")
+        self.cond = threading.Condition()
+        self.file = None
+        self.dirty = False
+        self.syncer = None
+        self.seq = 0
+        self.since_snapshot = 0
+        self.engine = None
+        self.offset = 0.0       # wall-clock time minus engine clock time
+
+    def attach(self, engine):
+        """
+        Restore `engine` from disk, then journal its changes from now on.
+        The caller ticks it once it has subscribed to its events.
+        """
+        self.engine = engine
+        self.offset = time.time() - engine.clock()
+        with engine.lock:
+            self.recover()
+            # Start from a fresh snapshot and an empty journal
+            self.write_snapshot()
+            engine.journal = self
+        return engine
+
+    def close(self):
+        """Sync what's left and stop journaling; the engine keeps running unjournaled."""
+        with self.engine.lock:
+            self.engine.journal = None
+        with self.cond:
+            if self.file:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+            self.dirty = False
+            self.cond.notify()
+
+    def recover(self):
+        snapshot_seq = 0
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.engine.import_state(snapshot["state"], self.offset)
+            snapshot_seq = self.seq = snapshot["seq"]
+        except FileNotFoundError:
+            pass
+
+        entries = []
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break   # torn write at the moment of the crash
+        except FileNotFoundError:
+            pass
+
+        # Replay with the clock pinned to each entry's time, so the timer
+        # makes exactly the decisions it made the first time round
+        engine = self.engine
+        clock = engine.clock
+        engine.replaying = True
+        try:
+            for entry in entries:
+                if entry["seq"] <= snapshot_seq:
+                    continue    # already in the snapshot
+                now = entry["t"] - self.offset
+                engine.clock = lambda: now
+                try:
+                    self.replay(entry["op"], entry.get("data"))
+                except ValueError:
+                    pass    # rejected now (e.g. MAX_PLAYERS changed); skip it
+                self.seq = entry["seq"]
+        finally:
+            engine.clock = clock
+            engine.replaying = False
+        # A running round is caught up to the present by its owner's first
+        # tick, once it has subscribed: a round that ended while we were
+        # down must still reach the round history
+
+    def replay(self, op, data):
+        if op == "action":
+            self.engine.apply_action(data)
+        elif op == "actions":
+            self.engine.apply_actions(data)
+        elif op == "tick":
+            self.engine.tick()
+        elif op == "end_round":
+            self.engine.end_round()
+
+    def append(self, op, data=None):
+        # Called by the engine with its lock held, so entries are in order
+        self.seq += 1
+        entry = {"seq": self.seq, "t": round(self.engine.clock() + self.offset, 3), "op": op}
+        if data is not None:
+            entry["data"] = data
+        with self.cond:
+            self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.dirty = True
+            if self.syncer is None:
+                self.syncer = threading.Thread(target=self._sync_loop, name="journal-sync", daemon=True)
+                self.syncer.start()
+            self.cond.notify()
+        self.since_snapshot += 1
+        if self.since_snapshot >= SNAPSHOT_EVERY:
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        snapshot = {"seq": self.seq, "state": self.engine.export_state(self.offset)}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Entries up to `seq` are in the snapshot now; if we crash before
+        # the truncation below, recover() skips them by seq
+        with self.cond:
+            if self.file:
+                self.file.close()
+            self.file = open(self.journal_path, "w", encoding="utf-8")
+            self.dirty = False
+        self.since_snapshot = 0
+
+    def _sync_loop(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.dirty or not self.file, JOURNAL_SYNC_LINGER)
+                if not self.dirty:
+                    # Quiet (or closed) journals don't keep a thread; append() starts a new one
+                    self.syncer = None
+                    return
+            # Let a burst of appends pile up, then sync them together
+            time.sleep(JOURNAL_SYNC_INTERVAL)
+            with self.cond:
+                if not self.file:
+                    continue
+                self.dirty = False
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+
+# ------------- ROUND HISTORY -------------
+
+HISTORY_FILE = "history.sqlite3"
+HISTORY_MAX_LIMIT = 100
+# Rounds that were played out; a round stopped early is still listed but
+# doesn't count toward anyone's totals and averages
+COUNTED_OUTCOMES = ("complete", "ended")
+
+HISTORY_SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    room TEXT NOT NULL,
+    ended_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    seeker TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS round_players (
+    round_id INTEGER NOT NULL REFERENCES rounds(id),
+    room TEXT NOT NULL,
+    player TEXT NOT NULL,
+    role TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    minute_points INTEGER NOT NULL,
+    found_after REAL
+);
+CREATE TABLE IF NOT EXISTS player_totals (
+    room TEXT NOT NULL,
+    player TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    minute_points INTEGER NOT NULL,
+    seeker_rounds INTEGER NOT NULL,
+    times_found INTEGER NOT NULL,
+    found_after_total REAL NOT NULL,
+    PRIMARY KEY (room, player)
+);
+CREATE INDEX IF NOT EXISTS rounds_by_time ON rounds (room, ended_at);
+CREATE INDEX IF NOT EXISTS round_players_by_player ON round_players (room, player, round_id);
+CREATE INDEX IF NOT EXISTS round_players_by_round ON round_players (round_id);
+CREATE INDEX IF NOT EXISTS player_totals_by_points ON player_totals (room, points);
+"""
+
+
+class RoundHistory:
+    """
+    Finished rounds in a local SQLite database, shared by every room.
+    Rounds are written by a background thread so the game never waits on
+    the disk. Per-player totals live in their own table, updated in the
+    same transaction as the round, so leaderboards and averages are index
+    lookups however many rounds have been stored. Only rounds with an
+    outcome in COUNTED_OUTCOMES go into the totals.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.db.executescript(HISTORY_SCHEMA)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="round-history", daemon=True)
+        self.thread.start()
+
+    def record(self, room_id, record):
+        """Queue a round_finished record for storage."""
+        self.queue.put((room_id, time.time(), record))
+
+    def _run(self):
+        while True:
+            room_id, ended_at, record = self.queue.get()
+            try:
+                self.store(room_id, ended_at, record)
+            except sqlite3.Error as e:
+                print(f"Could not save round: {e}")
+
+    def store(self, room_id, ended_at, record):
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT INTO rounds (room, ended_at, duration, outcome, seeker) VALUES (?, ?, ?, ?, ?)",
+                (room_id, ended_at, record['duration'], record['outcome'], record['seeker'])
+            )
+            round_id = cursor.lastrowid
+            players = record['players']
+            self.db.executemany(
+                "INSERT INTO round_players (round_id, room, player, role, points, minute_points, found_after) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(round_id, room_id, p['name'], p['role'], p['points'], p['minute_points'], p['found_after'])
+                 for p in players]
+            )
+            if record['outcome'] not in COUNTED_OUTCOMES:
+                return
+            self.db.executemany(
+                "INSERT INTO player_totals VALUES (?, ?, 1, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (room, player) DO UPDATE SET "
+                "rounds = rounds + 1, points = points + excluded.points, "
+                "minute_points = minute_points + excluded.minute_points, "
+                "seeker_rounds = seeker_rounds + excluded.seeker_rounds, "
+                "times_found = times_found + excluded.times_found, "
+                "found_after_total = found_after_total + excluded.found_after_total",
+                [(room_id, p['name'], p['points'], p['minute_points'], int(p['role'] == 'seeker'),
+                  int(p['found_after'] is not None), p['found_after'] or 0.0)
+                 for p in players]
+            )
+
+    # ------------- QUERIES -------------
+
+    def query(self, sql, params):
+        with self.lock:
+            return [dict(row) for row in self.db.execute(sql, params)]
+
+    TOTALS_COLUMNS = (
+        "player, rounds, points, minute_points, seeker_rounds, times_found, "
+        "ROUND(CAST(points AS REAL) / rounds, 2) AS avg_points, "
+        "CASE WHEN times_found THEN ROUND(found_after_total / times_found, 1) END AS avg_found_after"
+    )
+
+    def leaderboard(self, room_id, limit=10):
+        return self.query(
+            f"SELECT {self.TOTALS_COLUMNS} FROM player_totals WHERE room = ? "
+            "ORDER BY points DESC LIMIT ?",
+            (room_id, limit)
+        )
+
+    def player(self, room_id, name, limit=10):
+        """
+        A player's totals and averages plus their most recent rounds, or
+        None if they have never played. Someone whose rounds were all
+        stopped early has no totals row and gets zero totals.
+        """
+        recent = self.query(
+            "SELECT r.id, r.ended_at, r.duration, r.outcome, r.seeker, "
+            "p.role, p.points, p.minute_points, p.found_after "
+            "FROM round_players p JOIN rounds r ON r.id = p.round_id "
+            "WHERE p.room = ? AND p.player = ? ORDER BY p.round_id DESC LIMIT ?",
+            (room_id, name, limit)
+        )
+        if not recent:
+            return None
+        totals = self.query(
+            f"SELECT {self.TOTALS_COLUMNS} FROM player_totals WHERE room = ? AND player = ?",
+            (room_id, name)
+        )
+        if totals:
+            totals = totals[0]
+        else:
+            totals = {'player': name, 'rounds': 0, 'points': 0, 'minute_points': 0, 'seeker_rounds': 0,
+                      'times_found': 0, 'avg_points': None, 'avg_found_after': None}
+        totals['recent_rounds'] = recent
+        return totals
+
+    def recent_rounds(self, room_id, limit=10):
+        rounds = self.query(
+            "SELECT id, ended_at, duration, outcome, seeker FROM rounds "
+            "WHERE room = ? ORDER BY ended_at DESC LIMIT ?",
+            (room_id, limit)
+        )
+        if rounds:
+            by_id = {r['id']: r for r in rounds}
+            for r in rounds:
+                r['players'] = []
+            marks = ", ".join("?" * len(rounds))
+            for p in self.query(
+                "SELECT round_id, player, role, points, minute_points, found_after "
+                f"FROM round_players WHERE round_id IN ({marks})",
+                list(by_id)
+            ):
+                by_id[p.pop('round_id')]['players'].append(p)
+        return rounds
+
+
+# ------------- ROOMS -------------
+
+MAX_ROOMS = 64
+ROOM_IDLE_TTL = 600.0           # seconds an unused room is kept around
+ROOM_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+
+class TimerScheduler:
+    """
+    One thread that ticks every running game at its next deadline. Rooms
+    are kept in a heap ordered by deadline; a room whose round isn't
+    running simply isn't in the heap, so idle rooms cost nothing.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.cond = threading.Condition()
+        self.heap = []
+        self.scheduled = {}     # room -> deadline it is queued for
+        self.counter = itertools.count()
+        self.thread = threading.Thread(target=self._run, name="timer-scheduler", daemon=True)
+        self.thread.start()
+
+    def schedule(self, room):
+        deadline = room.next_deadline()
+        if deadline is None:
+            return
+        with self.cond:
+            queued = self.scheduled.get(room)
+            if queued is not None and queued <= deadline:
+                return
+            self.scheduled[room] = deadline
+            heapq.heappush(self.heap, (deadline, next(self.counter), room))
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.heap:
+                    self.cond.wait()
+                deadline, _, room = self.heap[0]
+                delay = deadline - self.clock()
+                if delay > 0:
+                    self.cond.wait(delay)
+                    continue
+                heapq.heappop(self.heap)
+                if self.scheduled.get(room) != deadline:
+                    continue    # superseded by an earlier entry
+                del self.scheduled[room]
+            TICK_LATENESS.observe(-delay, "scheduler")
+            try:
+                room.tick()
+            finally:
+                self.schedule(room)
+
+
+class GameRoom:
+    """
+    A headless game: an engine, its WebSocket and spectator hubs and a
+    way to apply actions, with no window. Actions are applied directly
+    on the calling server thread; the engine's lock keeps them consistent.
+    """
+
+    def __init__(self, room_id, scheduler, players=None, data_dir=None, history=None):
+        self.room_id = room_id
+        self.scheduler = scheduler
+        self.history = history
+        self.engine = GameEngine(players=players, clock=scheduler.clock)
+        self.journal = None
+        if data_dir:
+            self.journal = GameJournal(data_dir, room_id)
+            self.journal.attach(self.engine)
+        # Requests in progress (WebSockets included) and when the last one
+        # ended; both kept by the RoomRegistry under its lock
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.ws_hub = WebSocketHub(self.engine)
+        self.spectators = SpectatorHub(self.engine)
+        self.engine.subscribe(self.on_game_event)
+        # A round recovered from the journal catches up and keeps running
+        self.engine.tick()
+        self.scheduler.schedule(self)
+
+    def on_game_event(self, event, data):
+        if event == "round_started":
+            self.scheduler.schedule(self)
+        elif event == "round_finished" and self.history:
+            self.history.record(self.room_id, data["record"])
+
+    def next_deadline(self):
+        return self.engine.next_deadline()
+
+    def tick(self):
+        self.engine.tick()
+
+    def submit_action(self, data):
+        with self.engine.lock:
+            self.engine.apply_action(data)
+            return self.engine.state_version
+
+    def submit_actions(self, actions):
+        with self.engine.lock:
+            self.engine.apply_actions(actions)
+            return self.engine.get_state()
+
+    def idle(self):
+        """No requests, no spectators and no round: nothing would notice it going away."""
+        return not self.leases and not len(self.spectators) and not self.engine.timer_running
+
+    def close(self):
+        if self.journal:
+            self.journal.close()
+
+
+class RoomRegistry:
+    """
+    The games one server hosts, keyed by room id. `default` answers the
+    unprefixed routes; other rooms are created under /r/<room_id>/ when
+    their page is loaded or an action is posted, share one
+    TimerScheduler, and are evicted once idle for ROOM_IDLE_TTL (or
+    sooner, least recently used first, when the server is full). A
+    journaled room evicted this way, or left by an earlier run, comes
+    back as it was on its next request.
+    """
+
+    def __init__(self, default=None, max_rooms=MAX_ROOMS, data_dir=None):
+        self.scheduler = TimerScheduler()
+        self.max_rooms = max_rooms
+        self.data_dir = data_dir
+        self.history = None
+        if data_dir:
+            os.makedirs(data_dir, exist_ok=True)
+            self.history = RoundHistory(os.path.join(data_dir, HISTORY_FILE))
+        self.lock = threading.Lock()
+        self.default = default or self.create_room("main")
+        self.rooms = {"main": self.default}
+
+    def create_room(self, room_id):
+        return GameRoom(room_id, self.scheduler, data_dir=self.data_dir, history=self.history)
+
+    def get(self, room_id, create=False):
+        """
+        The room with this id, leased until release(); None if the id is
+        invalid, or there's no such room and `create` is false (and it has
+        no journal to come back from) or the server is full.
+        """
+        if not ROOM_ID_PATTERN.match(room_id):
+            return None
+        with self.lock:
+            room = self.rooms.get(room_id)
+            if room is None and (create or self.journaled(room_id)):
+                self.evict()
+                if len(self.rooms) < self.max_rooms:
+                    room = self.rooms[room_id] = self.create_room(room_id)
+            if room is not None and room is not self.default:
+                room.leases += 1
+            return room
+
+    def journaled(self, room_id):
+        # Every journaled room writes a snapshot as soon as it's created
+        return bool(self.data_dir) and os.path.exists(
+            os.path.join(self.data_dir, room_id + ".snapshot")
+        )
+
+    def release(self, room):
+        with self.lock:
+            room.leases -= 1
+            room.last_used = time.monotonic()
+
+    def evict(self):
+        # Called with self.lock held, only when a room is about to be created
+        idle = sorted(
+            (room for room in self.rooms.values() if room is not self.default and room.idle()),
+            key=lambda room: room.last_used
+        )
+        expired = time.monotonic() - ROOM_IDLE_TTL
+        for room in idle:
+            if room.last_used > expired and len(self.rooms) < self.max_rooms:
+                break
+            del self.rooms[room.room_id]
+            room.close()
+
+
+# ------------- QR CODES -------------
+
+QR_SIZE = 150
+
+
+class QRCodeCache:
+    """
+    Renders QR codes on a background thread and memoizes them by
+    (data, size). The PIL image is built straight from the QR module
+    matrix, with no PNG encode/decode round trip; turning it into a Tk
+    PhotoImage is left to the UI thread.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.lock = threading.Lock()
+
+    def request(self, data, size, callback):
+        """
+        Call callback(image) with the rendered code, immediately if it is
+        cached, otherwise from a worker thread once it has been rendered.
+        """
+        with self.lock:
+            image = self.images.get((data, size))
+        if image is not None:
+            callback(image)
+            return
+        threading.Thread(
+            target=self._render, args=(data, size, callback), name="qr-render", daemon=True
+        ).start()
+
+    def _render(self, data, size, callback):
+        image = render_qr_image(data, size)
+        with self.lock:
+            self.images[(data, size)] = image
+        callback(image)
+
+
+def render_qr_image(data, size):
+    # qrcode and PIL are most of this module's import time and only
+    # needed here, on the render thread, once the display is already up
+    import qrcode
+    from PIL import Image
+
+    qr = qrcode.QRCode(version=1, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    matrix = qr.get_matrix()
+    modules = len(matrix)
+    image = Image.new("L", (modules, modules))
+    image.putdata([0 if dark else 255 for row in matrix for dark in row])
+    # Nearest-neighbour keeps the modules crisp for scanning
+    return image.resize((size, size), Image.Resampling.NEAREST)
+
+
+# ------------- SOUND -------------
+
+# Built-in beep patterns (no external files), as (frequency Hz, duration ms)
+SOUND_PATTERNS = {
+    # Upward "ready go" trill
+    "start": [(600, 120), (800, 120), (1000, 150)],
+    # Quick rising "GO!" burst
+    "countdown_end": [(900, 80), (1100, 80), (1300, 120)],
+    # Little descending "end" jingle
+    "round_end": [(1000, 120), (800, 120), (600, 160)],
+    # Short playful ping-pong
+    "point": [(1200, 60), (900, 60)],
+    # Double "tick" to mark a minute
+    "minute": [(700, 80), (950, 80)],
+}
+SOUND_QUEUE_SIZE = 8
+SOUND_SAMPLE_RATE = 22050
+
+
+class NullSoundBackend:
+    def play(self, sound_type):
+        pass
+
+
+class WinsoundBackend:
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, sound_type):
+        for f, d in SOUND_PATTERNS[sound_type]:
+            self.winsound.Beep(f, d)
+
+
+class WavSoundBackend:
+    """
+    Synthesizes every pattern into an in-memory WAV clip once, up front,
+    and hands the bytes to `sink` when a sound is played.
+    """
+
+    def __init__(self, sink, sample_rate=SOUND_SAMPLE_RATE):
+        self.sink = sink
+        self.clips = {
+            name: synthesize_wav(pattern, sample_rate)
+            for name, pattern in SOUND_PATTERNS.items()
+        }
+
+    def play(self, sound_type):
+        self.sink(self.clips[sound_type])
+
+
+def synthesize_wav(pattern, sample_rate=SOUND_SAMPLE_RATE):
+    samples = array.array("h")
+    for freq, duration_ms in pattern:
+        count = sample_rate * duration_ms // 1000
+        fade = min(count // 2, sample_rate // 200)
+        for n in range(count):
+            # Short linear fade in/out so tones don't click
+            envelope = min(1.0, n / fade, (count - n) / fade) if fade else 1.0
+            samples.append(int(12000 * envelope * math.sin(2 * math.pi * freq * n / sample_rate)))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def winsound_sink(data):
+    import winsound
+    winsound.PlaySound(data, winsound.SND_MEMORY)
+
+
+def pipe_sink(command):
+    # e.g. ["aplay", "-q"]: the clip is written to the player's stdin
+    def sink(data):
+        subprocess.run(command, input=data, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+    return sink
+
+
+def create_sound_backend(name="auto"):
+    """
+    "winsound" beeps on Windows, "wav" plays synthesized clips (through
+    winsound on Windows, aplay/paplay elsewhere), "none" is silent and
+    "auto" picks the first of those that works here.
+    """
+    if name in ("auto", "winsound"):
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            if name == "winsound":
+                raise
+    if name in ("auto", "wav"):
+        try:
+            import winsound  # noqa: F401
+            return WavSoundBackend(winsound_sink)
+        except ImportError:
+            pass
+        for player in (["aplay", "-q"], ["paplay"]):
+            if shutil.which(player[0]):
+                return WavSoundBackend(pipe_sink(player))
+        if name == "wav":
+            raise RuntimeError("no WAV player found (tried aplay, paplay)")
+    return NullSoundBackend()
+
+
+class SoundPlayer:
+    """
+    Plays sounds on a worker thread so the display loop never waits for
+    audio. The queue is bounded, and a sound that is already waiting to
+    play isn't queued again, so a burst of "point" events plays once.
+    """
+
+    def __init__(self, backend, max_pending=SOUND_QUEUE_SIZE):
+        self.backend = backend
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.pending = set()
+        self.lock = threading.Lock()
+        threading.Thread(target=self._run, name="sound", daemon=True).start()
+
+    def play(self, sound_type):
+        with self.lock:
+            if sound_type in self.pending:
+                return
+            try:
+                self.queue.put_nowait(sound_type)
+            except queue.Full:
+                return
+            self.pending.add(sound_type)
+
+    def _run(self):
+        while True:
+            sound_type = self.queue.get()
+            with self.lock:
+                self.pending.discard(sound_type)
+            try:
+                self.backend.play(sound_type)
+            except Exception:
+                # Ignore sound errors quietly
+                pass
+
+
+# ------------- STARTUP -------------
+
+class StartupTimer:
+    """
+    Time spent in each startup step, printed as one line once the
+    display (or headless server) is ready. The first step is the CPU
+    time the process used before the timer existed: interpreter start
+    and module imports.
+    """
+
+    def __init__(self):
+        self.began = time.perf_counter() - time.process_time()
+        self.last = time.perf_counter()
+        self.steps = [("imports", self.last - self.began)]
+
+    def mark(self, step):
+        now = time.perf_counter()
+        self.steps.append((step, now - self.last))
+        self.last = now
+
+    def elapsed(self):
+        return time.perf_counter() - self.began
+
+    def report(self):
+        steps = ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds in self.steps)
+        return f"Startup: {steps} (ready after {(self.last - self.began) * 1000:.0f} ms)"
+
+
+# ------------- LOOP WATCHDOG -------------
+
+WATCHDOG_INTERVAL = 0.1
+STALL_THRESHOLD = 0.25
+
+TK_LOOP_LAG = METRICS.add(Histogram(
+    "hideandseek_ui_loop_lag_seconds", "How late a 100 ms Tk heartbeat runs."
+))
+TK_LOOP_STALLS = METRICS.add(Counter(
+    "hideandseek_ui_loop_stalls_total", "Tk heartbeats later than the stall threshold."
+))
+
+
+class LoopWatchdog:
+    """
+    Measures Tk event-loop latency with a heartbeat scheduled every
+    WATCHDOG_INTERVAL. A helper thread notices when the heartbeat is
+    overdue and samples the Tk thread's stack while it is still stuck,
+    so the stall report can name the callback that blocked the loop.
+    """
+
+    def __init__(self, root, ui_thread, threshold=STALL_THRESHOLD):
         self.root = root
-        self.root.title("Hide And Seek Game Display")
-        self.root.configure(bg="#1a1a1a")
+        self.ui_thread = ui_thread
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.expected = time.monotonic() + WATCHDOG_INTERVAL
+        self.stall_stack = None
+        self.root.after(int(WATCHDOG_INTERVAL * 1000), self.beat)
+        threading.Thread(target=self._watch, name="tk-watchdog", daemon=True).start()
 
-        # Fullscreen
-        self.root.attributes('-fullscreen', True)
-        self.root.bind('<Escape>', lambda e: self.root.attributes('-fullscreen', False))
+    def beat(self):
+        now = time.monotonic()
+        lag = max(0.0, now - self.expected)
+        TK_LOOP_LAG.observe(lag)
+        with self.lock:
+            stack, self.stall_stack = self.stall_stack, None
+            self.expected = now + WATCHDOG_INTERVAL
+        if lag > self.threshold:
+            TK_LOOP_STALLS.inc()
+            print(f"Tk loop stalled for {lag * 1000:.0f} ms{describe_stall(stack)}")
+        self.root.after(int(WATCHDOG_INTERVAL * 1000), self.beat)
 
-        # Players
-        self.players = [
-            {"name": "Player 1", "color": "#6B9BD1", "score": 0, "found": False},
-            {"name": "Player 2", "color": "#7DB88A", "score": 0, "found": False},
-            {"name": "Player 3", "color": "#D17B7B", "score": 0, "found": False}
-        ]
+    def _watch(self):
+        while True:
+            time.sleep(self.threshold / 2)
+            with self.lock:
+                if self.stall_stack is not None or time.monotonic() - self.expected < self.threshold:
+                    continue
+                frame = sys._current_frames().get(self.ui_thread.ident)
+                if frame is not None:
+                    self.stall_stack = traceback.extract_stack(frame)
 
-        self.seeker_index = 0
-        self.first_found_index = None
 
-        # Timer state
-        self.timer_running = False
-        self.timer_phase = None       # "hiding" or "seeking"
-        self.phase_start_time = 0
-        self.round_start_time = 0
-        self.last_minute_awarded = 0
-        self.after_id = None
+def describe_stall(stack):
+    """' in <callback>, at <innermost frame>' for a sampled Tk thread stack."""
+    if not stack:
+        return ""
+    # Tk dispatches through CallWrapper.__call__ (and after()'s own
+    # wrapper); the callback is the first of our frames below that
+    tk_file = os.path.join("tkinter", "__init__.py")
+    callback, dispatching = stack[-1], False
+    for frame in stack:
+        if tk_file in frame.filename:
+            dispatching = dispatching or frame.name == "__call__"
+        elif dispatching:
+            callback = frame
+            break
+    where = f" in {callback.name} ({os.path.basename(callback.filename)}:{callback.lineno})"
+    innermost = stack[-1]
+    if innermost is not callback:
+        where += f", at {innermost.name} ({os.path.basename(innermost.filename)}:{innermost.lineno})"
+    return where
+
+
+# ------------- SCOREBOARD RENDERERS -------------
+
+# Beyond this many players the columns get too narrow to read, so the
+# board switches to a timer panel beside a grid of compact player tiles
+WIDE_LAYOUT_MAX = 6
+
+# Per layout: (font size, pady) of each label in a player's column
+COLUMN_STYLES = {
+    "wide": {"padding": 20, "seeker": (16, 10), "name": (32, 20), "found": (18, 5),
+             "score": (56, 30), "score_seeker": (72, 30)},
+    "compact": {"padding": 6, "seeker": (11, 2), "name": (16, 4), "found": (11, 0),
+                "score": (28, 4), "score_seeker": (32, 4)},
+}
+
+
+def layout_mode(player_count):
+    return "wide" if player_count <= WIDE_LAYOUT_MAX else "compact"
+
+
+def tile_columns(tile_count):
+    # Roughly square tiles in the 4:3-ish area beside the timer panel
+    return max(1, math.ceil(math.sqrt(tile_count * 4 / 3)))
+
+
+class ColumnScoreboard:
+    """
+    The scoreboard as one tk.Frame column of labels per player, with the
+    timer and QR code in the seeker's column (or, with many players, in
+    a panel beside a grid of compact tiles). All widgets are created
+    once; a seeker change restyles the two columns involved in place.
+    """
+
+    def __init__(self, root, engine):
+        self.root = root
+        self.engine = engine
 
-        # UI references
         self.score_labels = []
         self.name_labels = []
         self.seeker_indicators = []
         self.column_frames = []
+        self.content_frames = []
         self.found_labels = []
 
-        # For web control
-        self.control_url = None
-
-        self.setup_ui()
-        self.start_web_server()
-
-    # ------------- UI SETUP -------------
+        self.mode = layout_mode(len(engine.players))
+        self.seeker_shown = None
+        self.weighted_columns = 0
+        self.tile_grid = (0, 0)
 
-    def setup_ui(self):
         self.main_container = tk.Frame(self.root, bg="#1a1a1a")
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
-        self.update_grid_weights()
         self.main_container.grid_rowconfigure(0, weight=1)
 
-        for i, player in enumerate(self.players):
+        # Used by the compact layout only
+        self.timer_panel = tk.Frame(self.main_container, bg="#1a1a1a")
+        self.tiles_frame = tk.Frame(self.main_container, bg="#1a1a1a")
+
+        for i, player in enumerate(self.engine.players):
             self.create_player_column(i, player)
 
-    def update_grid_weights(self):
-        for i in range(3):
-            self.main_container.grid_columnconfigure(i, weight=0)
-        for i in range(3):
-            self.main_container.grid_columnconfigure(i, weight=2 if i == self.seeker_index else 1)
+        self.create_timer_section()
+        self.arrange()
 
     def create_player_column(self, index, player):
-        is_seeker = (index == self.seeker_index)
-
         col_frame = tk.Frame(
             self.main_container,
             bg=player["color"],
@@ -79,69 +2309,134 @@ class HideAndSeekApp:
             highlightbackground="#0a0a0a",
             highlightthickness=2
         )
-        col_frame.grid(row=0, column=index, sticky="nsew", padx=5, pady=5)
-        self.column_frames.append(col_frame)
+        self.column_frames.insert(index, col_frame)
 
         content_frame = tk.Frame(col_frame, bg=player["color"])
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        content_frame.pack(fill=tk.BOTH, expand=True)
+        self.content_frames.insert(index, content_frame)
 
-        # Seeker indicator
+        # Seeker indicator; packed by style_column when this is the seeker
         seeker_indicator = tk.Label(
             content_frame,
             text="★ SEEKER ★",
-            font=("Arial", 16, "bold"),
             bg=player["color"],
             fg="#FFFFFF"
         )
-        if is_seeker:
-            seeker_indicator.pack(pady=10)
-        self.seeker_indicators.append(seeker_indicator)
+        self.seeker_indicators.insert(index, seeker_indicator)
 
         # Name
         name_label = tk.Label(
             content_frame,
             text=player["name"],
-            font=("Arial", 32, "bold"),
             bg=player["color"],
             fg="#FFFFFF"
         )
-        name_label.pack(pady=20)
-        self.name_labels.append(name_label)
+        name_label.pack()
+        self.name_labels.insert(index, name_label)
 
         # Found status
         found_label = tk.Label(
             content_frame,
-            text="",
-            font=("Arial", 18, "bold"),
+            text="✓ FOUND" if player["found"] else "",
             bg=player["color"],
             fg="#FFFF00"
         )
-        found_label.pack(pady=5)
-        self.found_labels.append(found_label)
+        found_label.pack()
+        self.found_labels.insert(index, found_label)
 
         # Score
-        score_size = 72 if is_seeker else 56
         score_label = tk.Label(
             content_frame,
-            text="0",
-            font=("Arial", score_size, "bold"),
+            text=str(player["score"]),
             bg=player["color"],
             fg="#FFFFFF"
         )
-        score_label.pack(pady=30)
-        self.score_labels.append(score_label)
+        score_label.pack()
+        self.score_labels.insert(index, score_label)
 
-        # Timer on seeker column
+        self.style_column(index)
+
+    def style_column(self, index):
+        """Fonts, padding and seeker badge of one column for the current layout."""
+        style = COLUMN_STYLES[self.mode]
+        is_seeker = index == self.engine.seeker_index
+
+        self.content_frames[index].pack_configure(padx=style["padding"], pady=style["padding"])
+
+        size, pady = style["seeker"]
+        indicator = self.seeker_indicators[index]
+        indicator.config(font=("Arial", size, "bold"))
         if is_seeker:
-            self.timer_container = content_frame
-            self.create_timer_section(content_frame, player["color"])
+            indicator.pack(pady=pady, before=self.name_labels[index])
+        else:
+            indicator.pack_forget()
+
+        for key, label in (("name", self.name_labels[index]), ("found", self.found_labels[index])):
+            size, pady = style[key]
+            label.config(font=("Arial", size, "bold"))
+            label.pack_configure(pady=pady)
+
+        size, pady = style["score_seeker" if is_seeker else "score"]
+        self.score_labels[index].config(font=("Arial", size, "bold"))
+        self.score_labels[index].pack_configure(pady=pady)
+
+        if self.mode == "wide":
+            self.main_container.grid_columnconfigure(index, weight=2 if is_seeker else 1)
+
+    def arrange(self):
+        """
+        Place every column for the current number of players. Only needed
+        when players join or leave; seeker changes go through set_seeker().
+        """
+        mode = self.mode = layout_mode(len(self.column_frames))
+
+        for i in range(self.weighted_columns):
+            self.main_container.grid_columnconfigure(i, weight=0)
+        rows, columns = self.tile_grid
+        for r in range(rows):
+            self.tiles_frame.grid_rowconfigure(r, weight=0)
+        for c in range(columns):
+            self.tiles_frame.grid_columnconfigure(c, weight=0)
+
+        if mode == "wide":
+            self.timer_panel.grid_forget()
+            self.tiles_frame.grid_forget()
+            for i, frame in enumerate(self.column_frames):
+                frame.grid(in_=self.main_container, row=0, column=i, sticky="nsew", padx=5, pady=5)
+            self.weighted_columns = len(self.column_frames)
+            self.tile_grid = (0, 0)
+        else:
+            self.timer_panel.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+            self.tiles_frame.grid(row=0, column=1, sticky="nsew")
+            self.main_container.grid_columnconfigure(0, weight=1)
+            self.main_container.grid_columnconfigure(1, weight=3)
+            self.weighted_columns = 2
+
+            columns = tile_columns(len(self.column_frames))
+            rows = math.ceil(len(self.column_frames) / columns)
+            for i, frame in enumerate(self.column_frames):
+                frame.grid(in_=self.tiles_frame, row=i // columns, column=i % columns,
+                           sticky="nsew", padx=3, pady=3)
+            for r in range(rows):
+                self.tiles_frame.grid_rowconfigure(r, weight=1, uniform="tile")
+            for c in range(columns):
+                self.tiles_frame.grid_columnconfigure(c, weight=1, uniform="tile")
+            self.tile_grid = (rows, columns)
+
+        # Restyle every column, since the layout or indices may have changed
+        self.seeker_shown = None
+        self.set_seeker()
 
-    def create_timer_section(self, parent, bg_color):
-        separator = tk.Frame(parent, bg="#FFFFFF", height=4)
-        separator.pack(fill=tk.X, pady=30, padx=20)
+    def create_timer_section(self):
+        # The timer widgets belong to main_container rather than a column,
+        # so pack(in_=...) can move them into whichever column is seeker
+        parent = self.main_container
+        bg_color = "#1a1a1a"
+
+        self.timer_separator = tk.Frame(parent, bg="#FFFFFF", height=4)
 
         timer_container = tk.Frame(parent, bg=bg_color)
-        timer_container.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.timer_container = timer_container
 
         timer_title = tk.Label(
             timer_container,
@@ -201,34 +2496,391 @@ class HideAndSeekApp:
         )
         self.url_label.pack(pady=5)
 
-    def rebuild_columns(self):
-        for frame in self.column_frames:
-            frame.destroy()
+        # Widgets whose background follows the seeker's column colour
+        self.timer_bg_widgets = [
+            timer_container, timer_title, self.phase_label, self.qr_label, self.url_label,
+            self.timer_panel
+        ]
 
-        self.column_frames = []
-        self.score_labels = []
-        self.name_labels = []
-        self.seeker_indicators = []
-        self.found_labels = []
+    def place_timer(self, index):
+        parent = self.content_frames[index] if self.mode == "wide" else self.timer_panel
+        self.timer_separator.pack(in_=parent, fill=tk.X, pady=30, padx=20)
+        self.timer_container.pack(in_=parent, fill=tk.BOTH, expand=True, pady=10)
+        # Columns added at runtime are created after the timer widgets and
+        # would stack above them; keep the timer on top, like the canvas'
+        # tag_raise("timer")
+        self.timer_separator.lift()
+        self.timer_container.lift()
+        for widget in self.timer_bg_widgets:
+            widget.config(bg=self.engine.players[index]["color"])
+
+    def set_seeker(self):
+        # Restyle in place; only the old and new seeker's columns change
+        seeker = self.engine.seeker_index
+        previous, self.seeker_shown = self.seeker_shown, seeker
+        if previous is None:
+            changed = range(len(self.column_frames))
+        else:
+            changed = {previous, seeker}
+        for i in changed:
+            self.style_column(i)
 
-        was_running = self.timer_running
+        self.place_timer(seeker)
 
-        self.update_grid_weights()
+    # ------------- ROSTER -------------
 
-        for i, player in enumerate(self.players):
-            self.create_player_column(i, player)
+    def add_player(self, index):
+        self.create_player_column(index, self.engine.players[index])
+        self.arrange()
+
+    def remove_player(self, index):
+        # Destroying the column unpacks the timer if it was in there;
+        # arrange() puts it back in the new seeker's column
+        self.column_frames[index].destroy()
+        for widgets in (self.score_labels, self.name_labels, self.seeker_indicators,
+                        self.column_frames, self.content_frames, self.found_labels):
+            del widgets[index]
+        self.arrange()
+
+    # ------------- UPDATES -------------
+
+    def set_score(self, index, score):
+        self.score_labels[index].config(text=str(score))
+
+    def set_name(self, index, name):
+        self.name_labels[index].config(text=name)
+
+    def set_found(self, index, found):
+        self.found_labels[index].config(text="✓ FOUND" if found else "")
+
+    def show_timer(self, title, text, phase_text, bg, fg):
+        self.timer_frame.config(bg=bg)
+        self.timer_title_label.config(text=title, bg=bg, fg="#FFFFFF")
+        self.timer_label.config(text=text, bg=bg, fg=fg)
+        self.phase_label.config(text=phase_text)
+
+    def show_qr(self, photo, url):
+        self.qr_label.configure(image=photo)
+        self.qr_label.image = photo
+        self.url_label.configure(text=url)
+
+
+class CanvasScoreboard:
+    """
+    The same column layout drawn on a single Canvas. Every score, name,
+    badge and timer readout is one canvas item created up front with
+    shared fonts; updates only reconfigure items whose value actually
+    changed, and nothing goes through Tk's geometry manager.
+    """
+
+    def __init__(self, root, engine):
+        self.root = root
+        self.engine = engine
+        self.fonts = {
+            "seeker": tkfont.Font(family="Arial", size=16, weight="bold"),
+            "name": tkfont.Font(family="Arial", size=32, weight="bold"),
+            "found": tkfont.Font(family="Arial", size=18, weight="bold"),
+            "score": tkfont.Font(family="Arial", size=56, weight="bold"),
+            "score_seeker": tkfont.Font(family="Arial", size=72, weight="bold"),
+            "timer_heading": tkfont.Font(family="Arial", size=24, weight="bold"),
+            "timer_title": tkfont.Font(family="Arial", size=14, weight="bold"),
+            "timer": tkfont.Font(family="Arial", size=56, weight="bold"),
+            "phase": tkfont.Font(family="Arial", size=18, weight="bold"),
+            "url": tkfont.Font(family="Arial", size=12, weight="bold"),
+        }
+        # Smaller column fonts for the compact tile layout
+        for key in ("seeker", "name", "found", "score", "score_seeker"):
+            size, _ = COLUMN_STYLES["compact"][key]
+            self.fonts[key + "_compact"] = tkfont.Font(family="Arial", size=size, weight="bold")
+        # Options last applied to each item, so unchanged values are skipped
+        self.item_state = {}
+        self.qr_photo = None
 
-        # Restore scores and found status
-        for i, player in enumerate(self.players):
-            self.score_labels[i].config(text=str(player["score"]))
-            if player["found"]:
-                self.found_labels[i].config(text="✓ FOUND")
+        self.canvas = tk.Canvas(root, bg="#1a1a1a", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.columns = [self.create_column(player) for player in engine.players]
+        self.create_timer_items()
+
+        self.canvas.bind("<Configure>", lambda e: self.layout())
+
+    def create_item(self, kind, **options):
+        coords = (0, 0) if kind in ("text", "image") else (0, 0, 0, 0)
+        item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+        self.item_state[item] = dict(options)
+        return item
+
+    def create_column(self, player):
+        return {
+            "bg": self.create_item("rectangle", fill=player["color"], outline="#0a0a0a", width=2),
+            "seeker": self.create_item("text", text="★ SEEKER ★", font=self.fonts["seeker"],
+                                       fill="#FFFFFF", state=tk.HIDDEN),
+            "name": self.create_item("text", text=player["name"], font=self.fonts["name"], fill="#FFFFFF"),
+            "found": self.create_item("text", text="✓ FOUND" if player["found"] else "",
+                                      font=self.fonts["found"], fill="#FFFF00"),
+            "score": self.create_item("text", text=str(player["score"]), font=self.fonts["score"],
+                                      fill="#FFFFFF"),
+        }
+
+    def create_timer_items(self):
+        # Tagged so they can be kept above columns added later
+        self.timer_items = {
+            "panel": self.create_item("rectangle", fill="#1a1a1a", outline="#0a0a0a", width=2,
+                                      state=tk.HIDDEN),
+            "separator": self.create_item("rectangle", fill="#FFFFFF", outline=""),
+            "heading": self.create_item("text", text="GAME TIMER", font=self.fonts["timer_heading"],
+                                        fill="#FFFFFF"),
+            "box": self.create_item("rectangle", fill="#2a2a2a", outline="#3a3a3a", width=4),
+            "title": self.create_item("text", text="READY", font=self.fonts["timer_title"], fill="#FFFFFF"),
+            "time": self.create_item("text", text="--:--", font=self.fonts["timer"], fill="#FFFFFF"),
+            "phase": self.create_item("text", text="Press START to begin", font=self.fonts["phase"],
+                                      fill="#FFFFFF"),
+            "qr": self.create_item("image", anchor=tk.N),
+            "url": self.create_item("text", text="", font=self.fonts["url"], fill="#FFFFFF"),
+        }
+        for item in self.timer_items.values():
+            self.canvas.addtag_withtag("timer", item)
+
+    def update_item(self, item, **options):
+        current = self.item_state.setdefault(item, {})
+        changed = {k: v for k, v in options.items() if current.get(k) != v}
+        if changed:
+            current.update(changed)
+            self.canvas.itemconfigure(item, **changed)
+
+    # ------------- LAYOUT -------------
+
+    def layout(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width < 2 or height < 2:
+            return
+
+        seeker = self.engine.seeker_index
+        if layout_mode(len(self.columns)) == "wide":
+            self.update_item(self.timer_items["panel"], state=tk.HIDDEN)
+            weights = [2 if i == seeker else 1 for i in range(len(self.columns))]
+            x = 0
+            for i, weight in enumerate(weights):
+                col_width = width * weight / sum(weights)
+                self.layout_column(i, x, 0, col_width, height, i == seeker)
+                x += col_width
+            return
+
+        # Compact: the timer gets a panel of its own, players become tiles
+        panel_width = width / 4
+        panel = self.timer_items["panel"]
+        self.update_item(panel, state=tk.NORMAL, fill=self.engine.players[seeker]["color"])
+        self.canvas.coords(panel, 5, 5, panel_width - 5, height - 5)
+        self.layout_timer(28, panel_width - 28, 0)
+
+        columns = tile_columns(len(self.columns))
+        rows = math.ceil(len(self.columns) / columns)
+        tile_width = (width - panel_width) / columns
+        tile_height = height / rows
+        for i in range(len(self.columns)):
+            row, col = divmod(i, columns)
+            self.layout_column(i, panel_width + col * tile_width, row * tile_height,
+                               tile_width, tile_height, i == seeker, compact=True)
+
+    def stack(self, item, cx, y, pady, visible=True):
+        # Place a text item the way pack(pady=...) places a Label
+        self.update_item(item, state=tk.NORMAL if visible else tk.HIDDEN)
+        if not visible:
+            return y
+        line = self.item_state[item]["font"].metrics("linespace")
+        self.canvas.coords(item, cx, y + pady + line / 2)
+        return y + 2 * pady + line
+
+    def layout_column(self, index, x, y, width, height, is_seeker, compact=False):
+        items = self.columns[index]
+        left, right = x + 5, x + width - 5
+        self.canvas.coords(items["bg"], left, y + 5, right, y + height - 5)
+
+        style = COLUMN_STYLES["compact" if compact else "wide"]
+        suffix = "_compact" if compact else ""
+        for key in ("seeker", "name", "found"):
+            self.update_item(items[key], font=self.fonts[key + suffix])
+        score_font = "score_seeker" if is_seeker else "score"
+        self.update_item(items["score"], font=self.fonts[score_font + suffix])
+
+        cx = (left + right) / 2
+        y += 5 + 3 + style["padding"]
+        y = self.stack(items["seeker"], cx, y, style["seeker"][1], visible=is_seeker)
+        y = self.stack(items["name"], cx, y, style["name"][1])
+        y = self.stack(items["found"], cx, y, style["found"][1])
+        y = self.stack(items["score"], cx, y, style["score"][1])
+
+        if is_seeker and not compact:
+            self.layout_timer(left + 23, right - 23, y)
+
+    def layout_timer(self, left, right, y):
+        t = self.timer_items
+        cx = (left + right) / 2
+
+        self.canvas.coords(t["separator"], left + 20, y + 30, right - 20, y + 34)
+        y += 64 + 10
+        y = self.stack(t["heading"], cx, y, 15)
+
+        title_line = self.fonts["timer_title"].metrics("linespace")
+        time_line = self.fonts["timer"].metrics("linespace")
+        box_width = self.fonts["timer"].measure("00:00") + 2 * 30 + 8
+        box_height = 4 + 5 + title_line + 5 + 20 + time_line + 20 + 4
+        top = y + 10
+        self.canvas.coords(t["box"], cx - box_width / 2, top, cx + box_width / 2, top + box_height)
+        self.canvas.coords(t["title"], cx, top + 4 + 5 + title_line / 2)
+        self.canvas.coords(t["time"], cx, top + 4 + 5 + title_line + 5 + 20 + time_line / 2)
+        y = top + box_height + 10
+
+        y = self.stack(t["phase"], cx, y, 15)
+        self.canvas.coords(t["qr"], cx, y + 20)
+        y += 20 + 150 + 20
+        self.stack(t["url"], cx, y, 5)
+
+    # ------------- UPDATES -------------
+
+    def set_score(self, index, score):
+        self.update_item(self.columns[index]["score"], text=str(score))
+
+    def set_name(self, index, name):
+        self.update_item(self.columns[index]["name"], text=name)
+
+    def set_found(self, index, found):
+        self.update_item(self.columns[index]["found"], text="✓ FOUND" if found else "")
+
+    def set_seeker(self):
+        self.layout()
+
+    def add_player(self, index):
+        self.columns.insert(index, self.create_column(self.engine.players[index]))
+        self.canvas.tag_raise("timer")
+        self.layout()
+
+    def remove_player(self, index):
+        for item in self.columns.pop(index).values():
+            self.canvas.delete(item)
+            self.item_state.pop(item, None)
+        self.layout()
+
+    def show_timer(self, title, text, phase_text, bg, fg):
+        t = self.timer_items
+        self.update_item(t["box"], fill=bg)
+        self.update_item(t["title"], text=title)
+        self.update_item(t["time"], text=text, fill=fg)
+        self.update_item(t["phase"], text=phase_text)
+
+    def show_qr(self, photo, url):
+        self.qr_photo = photo
+        self.update_item(self.timer_items["qr"], image=photo)
+        self.update_item(self.timer_items["url"], text=url)
+
+
+class HideAndSeekApp:
+    def __init__(self, root, engine=None, renderer="widgets", sound_backend=None, port=DEFAULT_PORT,
+                 data_dir=None, startup=None, max_connections=HTTP_MAX_CONNECTIONS):
+        self.root = root
+        self.port = port
+        self.max_connections = max_connections
+        self.startup = startup or StartupTimer()
+        self.root.title("Hide And Seek Game Display")
+        self.root.configure(bg="#1a1a1a")
+
+        # Fullscreen
+        self.root.attributes('-fullscreen', True)
+        self.root.bind('<Escape>', lambda e: self.root.attributes('-fullscreen', False))
+
+        # Game rules and state; this window just renders its events
+        self.room_id = "main"
+        self.data_dir = data_dir
+        self.history = None
+        self.engine = engine or GameEngine()
+        if data_dir:
+            # Scores and any round in progress survive a crash or restart
+            GameJournal(data_dir).attach(self.engine)
+        self.startup.mark("game state")
+        self.ui_thread = threading.current_thread()
+        self.after_id = None
+        self.timer_deadline = None
+        self.alert_batch = None
+        self.watchdog = LoopWatchdog(self.root, self.ui_thread)
+        self.sound = SoundPlayer(sound_backend or create_sound_backend())
+
+        # Actions from the web server are queued and applied here, on the
+        # Tk thread, one batch per frame
+        self.commands = CommandQueue(
+            lambda: self.root.after(UI_FRAME_MS, self.drain_commands)
+        )
+        # The server is up before the loop is; apply whatever it queued
+        # in the meantime as soon as the loop starts
+        self.root.after_idle(self.drain_commands)
+        METRICS.add(Gauge(
+            "hideandseek_command_queue_depth",
+            "Actions waiting to be applied on the Tk thread.",
+            lambda: len(self.commands)
+        ))
+
+        # For web control
+        self.control_url = None
+        self.qr_cache = QRCodeCache()
+        self.qr_photos = {}
+        self.ws_hub = WebSocketHub(self.engine)
+        self.spectators = SpectatorHub(self.engine)
+
+        # Serve first: phones can load the control page while the board
+        # is still being built, and their actions queue until it's up
+        self.start_web_server()
+        self.startup.mark("control server")
+
+        board_class = CanvasScoreboard if renderer == "canvas" else ColumnScoreboard
+        self.board = board_class(self.root, self.engine)
+        self.engine.subscribe(self.on_game_event)
+        self.startup.mark("scoreboard")
+
+        # Pick up a round recovered from the journal where it left off
+        self.update_timer()
+        self.render_timer(self.engine.get_timer_info())
+        self.root.after_idle(self.on_first_frame)
+
+    def on_first_frame(self):
+        self.startup.mark("first frame")
+        print(self.startup.report())
+        self.update_qr_code()
+
+    # ------------- COMMANDS -------------
+
+    def submit_action(self, data):
+        """
+        Queue a control action for the Tk thread and wait for it to be
+        applied. Returns the state version it produced; raises ValueError
+        for a bad action, TimeoutError if the display is stuck and the
+        action was dropped, CommandQueued if it's stuck but applying it.
+        """
+        def apply():
+            self.engine.apply_action(data)
+            return self.engine.state_version
+
+        return self.commands.call(apply, COMMAND_TIMEOUT)
+
+    def submit_actions(self, actions):
+        """
+        Queue a batch of actions to be applied atomically, with a single
+        alert for the whole batch. Returns the resulting state.
+        """
+        def apply():
+            self.alert_batch = []
+            try:
+                self.engine.apply_actions(actions)
+            finally:
+                alerts, self.alert_batch = self.alert_batch, None
+            if alerts:
+                self.show_alert(*alerts[-1])
+            return self.engine.get_state()
 
-        if was_running and hasattr(self, 'timer_label'):
-            self.root.after(100, self.update_timer)
+        return self.commands.call(apply, COMMAND_TIMEOUT)
 
-        if self.control_url:
-            self.update_qr_code()
+    def drain_commands(self):
+        with UI_CALLS.time("drain_commands"):
+            self.commands.drain()
 
     # ------------- QR / SOUND / ALERT -------------
 
@@ -236,55 +2888,34 @@ class HideAndSeekApp:
         if not self.control_url:
             return
 
-        qr = qrcode.QRCode(version=1, box_size=6, border=2)
-        qr.add_data(self.control_url)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='PNG')
-        img_byte_arr.seek(0)
-
-        pil_img = Image.open(img_byte_arr)
-        pil_img = pil_img.resize((150, 150), Image.Resampling.LANCZOS)
-        photo = ImageTk.PhotoImage(pil_img)
+        url = self.control_url
+        with UI_CALLS.time("update_qr_code"):
+            self.qr_cache.request(
+                url, QR_SIZE,
+                lambda image: self.run_on_ui(lambda: self.show_qr_image(url, image))
+            )
 
-        self.qr_label.configure(image=photo)
-        self.qr_label.image = photo
-        self.url_label.configure(text=self.control_url)
+    def show_qr_image(self, url, image):
+        # PhotoImage must be made on the Tk thread; keep one per image
+        with UI_CALLS.time("show_qr_image"):
+            photo = self.qr_photos.get(url)
+            if photo is None:
+                from PIL import ImageTk
+                photo = ImageTk.PhotoImage(image)
+                self.qr_photos[url] = photo
+                print(f"QR code shown {self.startup.elapsed() * 1000:.0f} ms after launch")
+            self.board.show_qr(photo, url)
 
     def play_sound(self, sound_type):
-        """
-        Use only built-in winsound.Beep patterns (no external files),
-        but make them more playful than a single beep.
-        """
-        try:
-            if sound_type == "start":
-                # Upward "ready go" trill
-                for f, d in [(600, 120), (800, 120), (1000, 150)]:
-                    winsound.Beep(f, d)
-            elif sound_type == "countdown_end":
-                # Quick rising "GO!" burst
-                for f, d in [(900, 80), (1100, 80), (1300, 120)]:
-                    winsound.Beep(f, d)
-            elif sound_type == "round_end":
-                # Little descending "end" jingle
-                for f, d in [(1000, 120), (800, 120), (600, 160)]:
-                    winsound.Beep(f, d)
-            elif sound_type == "point":
-                # Short playful ping-pong
-                for f, d in [(1200, 60), (900, 60)]:
-                    winsound.Beep(f, d)
-            elif sound_type == "minute":
-                # Double "tick" to mark a minute
-                for f, d in [(700, 80), (950, 80)]:
-                    winsound.Beep(f, d)
-        except Exception:
-            # Ignore sound errors quietly
-            pass
+        # Queued to the sound worker; never blocks the Tk thread
+        with UI_CALLS.time("play_sound"):
+            self.sound.play(sound_type)
 
     def show_alert(self, message, color="#ffff00"):
+        if self.alert_batch is not None:
+            self.alert_batch.append((message, color))
+            return
+
         alert = tk.Label(
             self.root,
             text=message,
@@ -299,419 +2930,632 @@ class HideAndSeekApp:
         alert.place(relx=0.5, rely=0.5, anchor='center')
         self.root.after(2000, alert.destroy)
 
-    # ------------- TIMER / GAME LOGIC -------------
+    # ------------- GAME EVENTS -------------
 
-    def start_round(self):
-        if self.timer_running:
-            return
-
-        # Reset all found flags
-        for player in self.players:
-            player["found"] = False
-        self.first_found_index = None
-        for label in self.found_labels:
-            label.config(text="")
+    def run_on_ui(self, callback):
+        # The engine and workers call in from other threads; Tk can't
+        if threading.current_thread() is self.ui_thread:
+            callback()
+        else:
+            self.root.after(0, callback)
 
-        self.timer_running = True
-        self.timer_phase = "hiding"  # 1-minute hiding
-        self.phase_start_time = time.time()
-        self.round_start_time = self.phase_start_time
-        self.last_minute_awarded = 0
+    def on_game_event(self, event, data):
+        self.run_on_ui(lambda: self.handle_game_event(event, data))
 
-        self.timer_frame.config(bg="#4a2020")
-        self.timer_title_label.config(text="HIDING (1 min)", bg="#4a2020", fg="#FFFFFF")
-        self.phase_label.config(text="HIDING...")
+    def handle_game_event(self, event, data):
+        handler = getattr(self, f"on_{event}", None)
+        if handler:
+            handler(data)
 
+    def on_round_started(self, data):
+        for i in range(len(self.engine.players)):
+            self.board.set_found(i, False)
         self.play_sound("start")
         self.show_alert("🙈 GO HIDE! 🙈", "#00ff00")
 
+        self.cancel_timer()
         self.update_timer()
 
-    def stop_timer(self):
-        self.timer_running = False
-        self.timer_phase = None
+    def on_seeking_started(self, data):
+        self.play_sound("countdown_end")
+        self.show_alert("🎯 START SEEKING! 🎯", "#00ff00")
 
-        if self.after_id:
-            self.root.after_cancel(self.after_id)
-            self.after_id = None
+    def on_minute(self, data):
+        self.play_sound("minute")
+        self.show_alert(f"⏰ MINUTE {data['minute']} ⏰", "#ffff00")
 
-        self.timer_frame.config(bg="#2a2a2a")
-        self.timer_title_label.config(text="READY", bg="#2a2a2a", fg="#FFFFFF")
-        self.timer_label.config(text="--:--", bg="#2a2a2a", fg="#FFFFFF")
-        self.phase_label.config(text="Press START to begin")
+    def on_warning(self, data):
+        # Last seconds of a phase
+        self.play_sound("minute" if data["phase"] == "hiding" else "countdown_end")
 
-        self.show_alert("⏹ TIMER STOPPED ⏹", "#ff6666")
+    def on_timer(self, data):
+        self.render_timer(data["timer"])
 
-    def update_timer(self):
-        if not self.timer_running:
-            return
+    def on_round_complete(self, data):
+        self.cancel_timer()
+        self.board.show_timer("READY", "DONE!", "Round Complete!", "#2a2a2a", "#FFFFFF")
+        self.play_sound("round_end")
+        self.show_alert("🏁 ROUND COMPLETE! 🏁", "#00ffff")
 
-        elapsed = time.time() - self.phase_start_time
+    def on_timer_stopped(self, data):
+        self.cancel_timer()
+        self.show_alert("⏹ TIMER STOPPED ⏹", "#ff6666")
 
-        # HIDING (1 min)
-        if self.timer_phase == "hiding":
-            remaining = max(0, 60 - int(elapsed))
-            mins, secs = divmod(remaining, 60)
+    def on_round_over(self, data):
+        self.cancel_timer()
+        self.board.show_timer("DONE!", "00:00", "Round Complete!", "#2a2a2a", "#FFFFFF")
+        self.play_sound("round_end")
 
-            self.timer_frame.config(bg="#4a2020")
-            self.timer_title_label.config(text="HIDING (1 min)", bg="#4a2020", fg="#FFFFFF")
-            self.timer_label.config(
-                text=f"{mins:02d}:{secs:02d}",
-                bg="#4a2020",
-                fg="#ff6666"
+        if data["next_seeker"] is not None:
+            self.show_alert(
+                f"🏁 ROUND OVER! Next seeker: {self.engine.players[data['next_seeker']]['name']} 🏁",
+                "#00ffff"
             )
-            self.phase_label.config(text="HIDING...")
-
-            # Last 5 seconds warning
-            if remaining <= 5 and remaining > 0:
-                if int(elapsed * 10) % 10 == 0:
-                    self.play_sound("minute")
-
-            if elapsed >= 60:
-                # Transition to SEEKING (5 min)
-                self.timer_phase = "seeking"
-                self.phase_start_time = time.time()
-                self.round_start_time = self.phase_start_time
-                self.last_minute_awarded = 0
-
-                self.play_sound("countdown_end")
-                self.show_alert("🎯 START SEEKING! 🎯", "#00ff00")
-
-        # SEEKING (5 min)
-        elif self.timer_phase == "seeking":
-            elapsed_seeking = time.time() - self.phase_start_time
-            remaining = max(0, 300 - int(elapsed_seeking))
-            mins, secs = divmod(remaining, 60)
+        else:
+            self.show_alert("🏁 ROUND COMPLETE! 🏁", "#00ffff")
+
+    def on_score(self, data):
+        self.update_score_display(data["index"])
+
+    def on_name(self, data):
+        self.update_name_display(data["index"])
+
+    def on_found(self, data):
+        index = data["index"]
+        self.board.set_found(index, True)
+        self.show_alert(
+            f"🎯 {self.engine.players[index]['name']} FOUND! 🎯",
+            "#00ffff"
+        )
+        self.play_sound("point")
 
-            self.timer_frame.config(bg="#204a20")
-            self.timer_title_label.config(text="SEEKING (5 min)", bg="#204a20", fg="#FFFFFF")
-            self.timer_label.config(
-                text=f"{mins:02d}:{secs:02d}",
-                bg="#204a20",
-                fg="#66ff66"
+    def on_seeker(self, data):
+        # Restyles columns in place (this used to rebuild them all)
+        with UI_CALLS.time("set_seeker"):
+            self.board.set_seeker()
+        if data["reason"] == "manual":
+            self.show_alert(
+                f"👁 {self.engine.players[data['index']]['name']} is now SEEKER! 👁",
+                "#ff9800"
             )
-            self.phase_label.config(text="ROUND IN PROGRESS")
 
-            current_minute = int(elapsed_seeking // 60)
-            if current_minute > self.last_minute_awarded and current_minute <= 5:
-                self.award_hider_points()
-                self.last_minute_awarded = current_minute
-                self.play_sound("minute")
-                self.show_alert(f"⏰ MINUTE {current_minute} ⏰", "#ffff00")
+    def on_scores_reset(self, data):
+        self.show_alert("🔄 SCORES RESET 🔄", "#ff6666")
 
-            # Last 10 seconds warning
-            if remaining <= 10 and remaining > 0:
-                if int(elapsed_seeking * 10) % 10 == 0:
-                    self.play_sound("countdown_end")
+    def on_round_finished(self, data):
+        if self.history:
+            self.history.record(self.room_id, data["record"])
 
-            if elapsed_seeking >= 300:
-                self.stop_timer()
-                self.timer_label.config(text="DONE!", bg="#2a2a2a", fg="#FFFFFF")
-                self.phase_label.config(text="Round Complete!")
-                self.play_sound("round_end")
-                self.show_alert("🏁 ROUND COMPLETE! 🏁", "#00ffff")
-                return
+    def on_player_added(self, data):
+        self.board.add_player(data["index"])
 
-        self.after_id = self.root.after(100, self.update_timer)
+    def on_player_removed(self, data):
+        self.board.remove_player(data["index"])
 
-    def end_round(self):
-        self.stop_timer()
-        self.timer_frame.config(bg="#2a2a2a")
-        self.timer_title_label.config(text="DONE!", bg="#2a2a2a", fg="#FFFFFF")
-        self.timer_label.config(text="00:00", bg="#2a2a2a", fg="#FFFFFF")
-        self.phase_label.config(text="Round Complete!")
-        self.play_sound("round_end")
+    # ------------- TIMER DISPLAY -------------
 
-        if self.first_found_index is not None:
-            self.show_alert(
-                f"🏁 ROUND OVER! Next seeker: {self.players[self.first_found_index]['name']} 🏁",
-                "#00ffff"
-            )
-            self.root.after(2500, lambda: self.set_seeker(self.first_found_index))
+    def update_timer(self):
+        # Sleep until the next second boundary/phase deadline instead of
+        # polling; the engine only emits when something is actually due
+        if self.timer_deadline is not None:
+            TICK_LATENESS.observe(max(0.0, self.engine.clock() - self.timer_deadline), "tk")
+        self.engine.tick()
+        deadline = self.timer_deadline = self.engine.next_deadline()
+        if deadline is None:
+            self.after_id = None
+            return
+        delay_ms = max(1, math.ceil((deadline - self.engine.clock()) * 1000))
+        self.after_id = self.root.after(delay_ms, self.update_timer)
+
+    def cancel_timer(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.timer_deadline = None
+
+    def render_timer(self, timer):
+        if timer["phase"] == "hiding":
+            bg, fg, phase_text = "#4a2020", "#ff6666", "HIDING..."
+        elif timer["phase"] == "seeking":
+            bg, fg, phase_text = "#204a20", "#66ff66", "ROUND IN PROGRESS"
         else:
-            self.show_alert("🏁 ROUND COMPLETE! 🏁", "#00ffff")
+            bg, fg, phase_text = "#2a2a2a", "#FFFFFF", "Press START to begin"
 
-    def award_hider_points(self):
-        for i in range(len(self.players)):
-            if i != self.seeker_index and not self.players[i]["found"]:
-                self.players[i]["score"] += 1
-                self.update_score_display(i)
+        self.board.show_timer(timer["label"], timer["time"], phase_text, bg, fg)
 
     def update_score_display(self, player_index):
-        self.score_labels[player_index].config(
-            text=str(self.players[player_index]["score"])
-        )
+        self.board.set_score(player_index, self.engine.players[player_index]["score"])
         self.play_sound("point")
 
     def update_name_display(self, player_index):
-        self.name_labels[player_index].config(
-            text=self.players[player_index]["name"]
-        )
+        self.board.set_name(player_index, self.engine.players[player_index]["name"])
 
-    def set_seeker(self, index):
-        if self.seeker_index != index:
-            self.seeker_index = index
-            self.rebuild_columns()
-            self.show_alert(
-                f"👁 {self.players[index]['name']} is now SEEKER! 👁",
-                "#ff9800"
-            )
+    # ------------- WEB SERVER -------------
 
-    def mark_player_found(self, player_index):
-        if player_index == self.seeker_index:
-            return
+    def start_web_server(self):
+        # The window is the default room; /r/<room_id>/ hosts more games
+        rooms = RoomRegistry(default=self, data_dir=self.data_dir)
+        self.history = rooms.history
+        server = start_control_server(rooms, self.port, self.max_connections)
 
-        if not self.players[player_index]["found"]:
-            self.players[player_index]["found"] = True
+        self.control_url = f"http://{get_local_ip()}:{server.server_address[1]}"
 
-            if self.first_found_index is None:
-                self.first_found_index = player_index
+        print(f"\n{'='*50}")
+        print(f"Control Panel URL: {self.control_url}")
+        print(f"Spectator View:    {self.control_url}/watch")
+        print(f"{'='*50}\n")
 
-            self.found_labels[player_index].config(text="✓ FOUND")
 
-            self.players[self.seeker_index]["score"] += 3
-            self.update_score_display(self.seeker_index)
+# ------------- CONTROL SERVER -------------
 
-            self.show_alert(
-                f"🎯 {self.players[player_index]['name']} FOUND! 🎯",
-                "#00ffff"
-            )
-            self.play_sound("point")
+# Long-lived responses; their duration isn't a latency
+STREAM_ROUTES = ('/events', '/ws', '/watch/events')
+
+
+def metric_route(path):
+    """Route label for metrics: the path within the room, without ids or names."""
+    if path in ('/', '/state', '/actions', '/events', '/ws', '/metrics', '/time',
+                '/watch', '/watch/events'):
+        return path
+    if path and path.startswith('/static/'):
+        return '/static'
+    if path and path.startswith('/history/'):
+        return '/history'
+    return 'other'
 
-    # ------------- WEB SERVER -------------
 
-    def get_local_ip(self):
+class ControlHandler(BaseHTTPRequestHandler):
+    """
+    Routes for the control page. /r/<room_id>/... addresses one room of
+    a multi-room server; the unprefixed routes go to the default room.
+    """
+
+    # Keep-alive: phones reuse one connection for polls and actions.
+    # Headers and body go out as separate writes, so Nagle would hold
+    # the body back for a delayed ACK on a reused connection
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # Per-request socket timeout so a stalled client frees its worker
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def handle_one_request(self):
+        # A kept-alive connection may sit idle between requests for a
+        # while; once a request line arrives the rest must follow promptly
+        self.connection.settimeout(self.server.idle_timeout)
+        super().handle_one_request()
+
+    def parse_request(self):
+        self.connection.settimeout(self.server.request_timeout)
+        return super().parse_request()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_response(self, code, message=None):
+        self.status = code
+        super().send_response(code, message)
+
+    def route(self):
+        """Resolve self.room and return the path within it (None if there's no such room)."""
+        path = urlsplit(self.path).path
+        if path.startswith('/r/'):
+            room_id, _, rest = path[3:].partition('/')
+            path = '/' + rest
+            # Only loading a page or acting creates a room; assets, polls
+            # and streams of a room nobody opened are just 404s
+            create = self.command == 'POST' or path in ('/', '/watch')
+            self.room = self.lease = self.server.rooms.get(room_id, create)
+            if self.room is None:
+                path = None
+        else:
+            self.room = self.server.rooms.default
+        self.metric_route = metric_route(path)
+        return path
+
+    def timed(self, method, handler):
+        start = time.perf_counter()
+        self.status = None
+        self.metric_route = 'other'
+        self.lease = None
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except Exception:
-            return "127.0.0.1"
+            handler()
+        finally:
+            if self.lease is not None and self.lease is not self.server.rooms.default:
+                self.server.rooms.release(self.lease)
+            HTTP_REQUESTS.inc(method, self.metric_route, self.status or 0)
+            if self.metric_route not in STREAM_ROUTES:
+                HTTP_LATENCY.observe(time.perf_counter() - start, method, self.metric_route)
 
-    def start_web_server(self):
-        app = self
+    def do_GET(self):
+        self.timed('GET', self.handle_get)
 
-        class ControlHandler(BaseHTTPRequestHandler):
-            def log_message(self, format, *args):
-                pass
+    def do_POST(self):
+        self.timed('POST', self.handle_post)
+
+    def handle_get(self):
+        path = self.route()
+        if path is None:
+            self.send_error(404, 'No such room')
+        elif path in self.server.static_assets:
+            self.send_static(self.server.static_assets[path])
+        elif path == '/state':
+            self.send_state()
+        elif path == '/events':
+            self.stream_events()
+        elif path == '/ws':
+            self.open_websocket()
+        elif path == '/watch/events':
+            self.stream_to_spectator()
+        elif path.startswith('/history/'):
+            self.send_history(path)
+        elif path == '/metrics':
+            self.send_metrics()
+        elif path == '/time':
+            self.send_time()
+        else:
+            self.send_error(404)
+
+    def send_time(self):
+        # Clock sync for the countdown: as small and uncached as possible
+        body = json.dumps({'now': round(self.room.engine.clock(), 3)}).encode()
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_metrics(self):
+        body = METRICS.render().encode()
+        self.send_response(200)
+        self.send_header('Content-type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_static(self, asset):
+        use_gzip = accepts_gzip(self.headers.get('Accept-Encoding', ''))
+        body, etag = (asset.gzip, asset.gzip_etag) if use_gzip else (asset.identity, asset.etag)
 
-            def do_GET(self):
-                if self.path == '/':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
-                    self.end_headers()
-                    self.wfile.write(self.get_control_html().encode())
-                elif self.path == '/state':
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.end_headers()
-
-                    timer_info = {
-                        'running': False,
-                        'phase': None,
-                        'time': '--:--',
-                        'label': 'READY'
-                    }
-
-                    if app.timer_running:
-                        elapsed = time.time() - app.phase_start_time
-                        if app.timer_phase == 'hiding':
-                            remaining_hiding = max(0, 60 - int(elapsed))
-                            mins_h, secs_h = divmod(remaining_hiding, 60)
-                            timer_info = {
-                                'running': True,
-                                'phase': 'hiding',
-                                'time': f'{mins_h:02d}:{secs_h:02d}',
-                                'label': 'HIDING (1 min)'
-                            }
-                        elif app.timer_phase == 'seeking':
-                            elapsed_seeking = time.time() - app.phase_start_time
-                            remaining_seeking = max(0, 300 - int(elapsed_seeking))
-                            mins_s, secs_s = divmod(remaining_seeking, 60)
-                            timer_info = {
-                                'running': True,
-                                'phase': 'seeking',
-                                'time': f'{mins_s:02d}:{secs_s:02d}',
-                                'label': 'SEEKING (5 min)'
-                            }
-
-                    state = {
-                        'players': app.players,
-                        'seeker_index': app.seeker_index,
-                        'timer_running': app.timer_running,
-                        'timer': timer_info
-                    }
-                    self.wfile.write(json.dumps(state).encode())
-
-            def do_POST(self):
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode())
-
-                action = data.get('action')
-
-                if action == 'set_seeker':
-                    app.root.after(0, lambda: app.set_seeker(data['index']))
-                elif action == 'add_point':
-                    app.players[data['index']]['score'] += 1
-                    app.root.after(0, lambda: app.update_score_display(data['index']))
-                elif action == 'player_found':
-                    app.root.after(0, lambda: app.mark_player_found(data['index']))
-                elif action == 'reset_scores':
-                    for i, player in enumerate(app.players):
-                        player['score'] = 0
-                        app.root.after(0, lambda idx=i: app.update_score_display(idx))
-                    app.root.after(0, lambda: app.show_alert("🔄 SCORES RESET 🔄", "#ff6666"))
-                elif action == 'start_round':
-                    app.root.after(0, app.start_round)
-                elif action == 'stop_timer':
-                    app.root.after(0, app.stop_timer)
-                elif action == 'update_name':
-                    app.players[data['index']]['name'] = data['name']
-                    app.root.after(0, lambda: app.update_name_display(data['index']))
-
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', asset.cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', asset.cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_state(self):
+        query = parse_qs(urlsplit(self.path).query)
+        engine = self.room.engine
+        etag = f'"{engine.epoch}-{engine.state_version}"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        since = None
+        if 'since' in query:
+            try:
+                since = int(query['since'][0])
+            except ValueError:
+                self.send_error(400, 'since must be an integer')
+                return
+            if query.get('epoch', [None])[0] != engine.epoch:
+                # A version from another run of the engine; it means nothing here
+                since = None
+            elif since == engine.state_version:
+                self.send_response(304)
+                self.send_header('ETag', etag)
                 self.end_headers()
-                self.wfile.write(json.dumps({'status': 'ok'}).encode())
+                return
+
+        # Pre-encoded bytes shared with every other poller
+        version, body = engine.encoded_state(since)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', f'"{engine.epoch}-{version}"')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_history(self, path):
+        history = self.server.rooms.history
+        if history is None:
+            self.send_error(404, 'Round history is disabled')
+            return
+
+        query = parse_qs(urlsplit(self.path).query)
+        try:
+            limit = min(max(int(query.get('limit', ['10'])[0]), 1), HISTORY_MAX_LIMIT)
+        except ValueError:
+            self.send_error(400, 'limit must be an integer')
+            return
+
+        room_id = self.room.room_id
+        if path == '/history/leaderboard':
+            payload = {'leaderboard': history.leaderboard(room_id, limit)}
+        elif path == '/history/rounds':
+            payload = {'rounds': history.recent_rounds(room_id, limit)}
+        elif path.startswith('/history/players/'):
+            payload = history.player(room_id, unquote(path[len('/history/players/'):]), limit)
+            if payload is None:
+                self.send_error(404, 'No rounds recorded for that player')
+                return
+        else:
+            self.send_error(404)
+            return
+        self.send_json(200, payload)
+
+    def stream_events(self):
+        # Server-Sent Events: push the state only when it differs
+        # from what this client last received.
+        # No length for an endless stream, so it can't be kept alive
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        serial = None
+        last_version = None
+        try:
+            while True:
+                changed, serial = self.room.engine.wait_for_state_change(serial, SSE_HEARTBEAT)
+                version, body = self.room.engine.encoded_state()
+                if version != last_version:
+                    self.wfile.write(b"data: " + body + b"\n\n")
+                    last_version = version
+                elif not changed:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+
+    def stream_to_spectator(self):
+        # Same event stream as /events, but written by the room's
+        # SpectatorHub; this worker is free as soon as the headers are out
+        hub = self.room.spectators
+        if len(hub) >= hub.max_spectators:
+            self.send_error(503, 'Too many spectators')
+            return
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.flush()
+        if hub.add(self.connection):
+            self.server.detach(self.connection)
+
+    def handle_post(self):
+        path = self.route()
+        if path not in ('/state', '/actions'):
+            self.send_error(404)
+            return
+
+        try:
+            content_length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.send_error(411, 'Content-Length required')
+            return
+        if content_length < 0:
+            # rfile.read(-1) would wait for the client to hang up
+            self.send_error(400, 'Invalid Content-Length')
+            return
+        if content_length > HTTP_MAX_BODY:
+            self.send_error(413)
+            return
+        post_data = self.rfile.read(content_length)
+
+        try:
+            data = json.loads(post_data.decode())
+            if path == '/actions':
+                # Either a bare list or {"actions": [...]}
+                if isinstance(data, dict):
+                    data = data.get('actions')
+                state = self.room.submit_actions(data)
+                result = {'status': 'ok', 'version': state['version'], 'state': state}
+            else:
+                if not isinstance(data, dict):
+                    raise ValueError('expected a JSON object')
+                result = {'status': 'ok', 'version': self.room.submit_action(data)}
+        except ValueError as e:
+            self.send_json(400, {'status': 'error', 'error': str(e)})
+        except TimeoutError:
+            self.send_json(503, {'status': 'error', 'error': 'display is not responding'})
+        except CommandQueued:
+            # Will be applied, just not yet; a retry would apply it twice
+            self.send_json(202, {'status': 'queued'})
+        else:
+            self.send_json(200, result)
+
+    def send_json(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def open_websocket(self):
+        key = self.headers.get('Sec-WebSocket-Key')
+        if self.headers.get('Upgrade', '').lower() != 'websocket' or not key:
+            self.send_error(400, 'Expected a WebSocket upgrade')
+            return
+
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', websocket_accept_key(key))
+        self.end_headers()
+        self.close_connection = True
+
+        ws = WebSocket(self.connection)
+        self.room.ws_hub.add(ws)
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                self.handle_ws_message(ws, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.room.ws_hub.remove(ws)
+            ws.close()
+
+    def handle_ws_message(self, ws, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            ws.send_json({'type': 'ack', 'seq': None, 'status': 'error', 'error': 'invalid JSON'})
+            return
+        seq = data.get('seq') if isinstance(data, dict) else None
+        try:
+            if not isinstance(data, dict):
+                raise ValueError('expected a JSON object')
+            version = self.room.submit_action(data)
+        except ValueError as e:
+            ws.send_json({'type': 'ack', 'seq': seq, 'status': 'error', 'error': str(e)})
+        except TimeoutError:
+            ws.send_json({'type': 'ack', 'seq': seq, 'status': 'error',
+                          'error': 'display is not responding'})
+        except CommandQueued:
+            ws.send_json({'type': 'ack', 'seq': seq, 'status': 'queued'})
+        else:
+            ws.send_json({'type': 'ack', 'seq': seq, 'status': 'ok', 'version': version})
+
+
+class ControlServer(PooledHTTPServer):
+    def __init__(self, server_address, rooms, max_connections=HTTP_MAX_CONNECTIONS):
+        self.rooms = rooms
+        self.static_assets = build_static_assets()
+        super().__init__(server_address, ControlHandler, max_connections=max_connections)
+        METRICS.add(Gauge(
+            "hideandseek_http_open_connections", "Open control connections, idle ones included.",
+            self.open_connections
+        ))
+
+
+def get_local_ip():
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]
+        s.close()
+        return ip
+    except Exception:
+        return "127.0.0.1"
+
+
+def start_control_server(rooms, port=DEFAULT_PORT, max_connections=HTTP_MAX_CONNECTIONS):
+    server = ControlServer(('0.0.0.0', port), rooms, max_connections)
+    threading.Thread(target=server.serve_forever, name="http-accept", daemon=True).start()
+    return server
+
+
+def run_headless(port=DEFAULT_PORT, data_dir=None, startup=None, max_connections=HTTP_MAX_CONNECTIONS):
+    """Serve rooms with no display window, e.g. one host for several arenas."""
+    startup = startup or StartupTimer()
+    rooms = RoomRegistry(data_dir=data_dir)
+    startup.mark("game state")
+    server = start_control_server(rooms, port, max_connections)
+    startup.mark("control server")
+    url = f"http://{get_local_ip()}:{server.server_address[1]}"
+    print(f"Serving rooms at {url}/r/<room_id>/ (default room at {url}/)")
+    print(startup.report())
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+# ------------- PAGE CLOCK -------------
+
+# Loaded by both pages ahead of their own script
+CLOCK_JS = '''// Server engine clock minus performance.now(), in seconds; refined by
+// syncClock() from the round trip with the smallest delay
+let clockOffset = null;
+let clockRtt = Infinity;
+let countdownTimer = null;
+
+async function syncClock(url, onSynced) {
+    try {
+        const sent = performance.now();
+        const response = await fetch(url, {cache: 'no-store'});
+        const {now} = await response.json();
+        const received = performance.now();
+        const rtt = received - sent;
+        // Older samples age, so a slightly slower fresh one still wins
+        if (clockOffset === null || rtt <= clockRtt * 1.5) {
+            clockRtt = rtt;
+            clockOffset = now - (sent + received) / 2000;
+            onSynced();
+        }
+    } catch (error) {
+        console.error('Error syncing clock:', error);
+    }
+}
+
+function startClock(url, onSynced) {
+    syncClock(url, onSynced);
+    setInterval(() => syncClock(url, onSynced), 30000);
+}
+
+function serverNow() {
+    return performance.now() / 1000 + clockOffset;
+}
+
+function formatTime(seconds) {
+    const mins = Math.floor(seconds / 60);
+    const secs = seconds % 60;
+    return String(mins).padStart(2, '0') + ':' + String(secs).padStart(2, '0');
+}
+
+// Show a running timer's time left in `label`, calling render() again
+// just after the displayed second changes
+function showCountdown(timer, label, render) {
+    clearTimeout(countdownTimer);
+    if (timer.running && timer.deadline !== undefined && clockOffset !== null) {
+        const left = Math.max(0, timer.deadline - serverNow());
+        label.textContent = formatTime(Math.min(Math.ceil(left), timer.duration));
+        if (left > 0) {
+            countdownTimer = setTimeout(render, (left - Math.floor(left)) * 1000 + 20);
+        }
+    }
+}
+'''
 
-            def get_control_html(self):
-                return '''<!DOCTYPE html>
+
+# ------------- CONTROL PAGE -------------
+
+CONTROL_PAGE = '''<!DOCTYPE html>
 <html>
 <head>
     <meta name="viewport" content="width=device-width, initial-scale=1">
     <meta charset="UTF-8">
     <title>Hide and Seek Control</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            background: #1a1a1a;
-            color: #fff;
-            padding: 20px;
-            margin: 0;
-        }
-        h1 {
-            text-align: center;
-            color: #fff;
-        }
-        .section {
-            background: #2a2a2a;
-            border-radius: 10px;
-            padding: 20px;
-            margin: 20px 0;
-        }
-        .timer-display {
-            display: flex;
-            justify-content: center;
-            margin: 20px 0;
-        }
-        .timer-box {
-            background: #3a3a3a;
-            border-radius: 10px;
-            padding: 20px 40px;
-            text-align: center;
-            min-width: 200px;
-        }
-        .timer-box.active {
-            border: 3px solid #4CAF50;
-            animation: pulse 1.5s infinite;
-        }
-        @keyframes pulse {
-            0%, 100% { border-color: #4CAF50; }
-            50% { border-color: #66ff66; }
-        }
-        .timer-label {
-            font-size: 14px;
-            color: #999;
-            margin-bottom: 10px;
-            text-transform: uppercase;
-            font-weight: bold;
-        }
-        .timer-time {
-            font-size: 42px;
-            font-weight: bold;
-            font-family: 'Courier New', monospace;
-        }
-        .timer-box.hiding .timer-time {
-            color: #ffff66;
-        }
-        .timer-box.seeking .timer-time {
-            color: #66ff66;
-        }
-        .timer-box.inactive .timer-time {
-            color: #666;
-        }
-        .player-card {
-            background: #3a3a3a;
-            border-radius: 8px;
-            padding: 15px;
-            margin: 10px 0;
-        }
-        .player-name {
-            font-size: 20px;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }
-        .player-status {
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 5px;
-            font-size: 12px;
-            font-weight: bold;
-            margin-left: 10px;
-        }
-        .status-found {
-            background: #ff9800;
-            color: white;
-        }
-        input[type="text"] {
-            width: 200px;
-            padding: 8px;
-            font-size: 16px;
-            border-radius: 5px;
-            border: none;
-            margin: 5px 0;
-        }
-        button {
-            background: #4CAF50;
-            color: white;
-            border: none;
-            padding: 12px 24px;
-            font-size: 16px;
-            border-radius: 8px;
-            margin: 5px;
-            cursor: pointer;
-            font-weight: bold;
-        }
-        button:active {
-            transform: scale(0.95);
-        }
-        .seeker-btn {
-            background: #ff9800;
-        }
-        .found-btn {
-            background: #2196F3;
-        }
-        .timer-btn {
-            background: #9C27B0;
-            width: 100%;
-            padding: 15px;
-            font-size: 18px;
-        }
-        .reset-btn {
-            background: #f44336;
-            width: 100%;
-            padding: 15px;
-            font-size: 18px;
-        }
-        .btn-row {
-            display: flex;
-            gap: 10px;
-            flex-wrap: wrap;
-        }
-    </style>
+    <link rel="stylesheet" href="/static/control.css?v={css_version}">
 </head>
 <body>
     <h1>&#x1F3AE; Hide and Seek Control Panel</h1>
@@ -731,6 +3575,7 @@ class HideAndSeekApp:
     <div class="section">
         <h2>Players</h2>
         <div id="players"></div>
+        <button onclick="addPlayer()">+ ADD PLAYER</button>
     </div>
     
     <div class="section">
@@ -738,137 +3583,642 @@ class HideAndSeekApp:
         <button class="reset-btn" onclick="resetScores()">RESET ALL SCORES</button>
     </div>
     
-    <script>
-        const players = [
-            {name: "Player 1", color: "#6B9BD1"},
-            {name: "Player 2", color: "#7DB88A"},
-            {name: "Player 3", color: "#D17B7B"}
-        ];
-        
-        let currentState = null;
-        
-        function renderPlayers() {
-            if (!currentState) return;
-            
-            const container = document.getElementById('players');
-            container.innerHTML = currentState.players.map((player, i) => {
-                const isSeeker = i === currentState.seeker_index;
-                const foundBadge = player.found ? '<span class="player-status status-found">&#x2713; FOUND</span>' : '';
-                const seekerBadge = isSeeker ? '<span class="player-status" style="background: #9C27B0; color: white;">&#x2605; SEEKER</span>' : '';
-                
-                return `
-                <div class="player-card" style="border-left: 5px solid ${player.color}">
-                    <div class="player-name" style="color: ${player.color}">
-                        ${player.name} ${seekerBadge}${foundBadge}
-                        <span style="float: right; color: white;">Score: ${player.score}</span>
-                    </div>
-                    <input type="text" id="name-${i}" value="${player.name}" 
-                           onchange="updateName(${i})" placeholder="Player name">
-                    <div class="btn-row">
-                        <button class="seeker-btn" onclick="setSeeker(${i})">Set as Seeker</button>
-                        <button onclick="addPoint(${i})">+1 Point</button>
-                        <button class="found-btn" onclick="playerFound(${i})">Found This Player</button>
-                    </div>
-                </div>
-            `}).join('');
-        }
-        
-        function updateTimers() {
-            if (!currentState || !currentState.timer) return;
-            
-            const timer = currentState.timer;
-            const timerBox = document.getElementById('main-timer');
-            const timerLabel = document.getElementById('timer-label');
-            const timerTime = document.getElementById('timer-time');
-            
-            timerLabel.textContent = timer.label || 'READY';
-            timerTime.textContent = timer.time || '--:--';
-            
-            timerBox.className = 'timer-box';
-            
-            if (timer.running && timer.phase === 'hiding') {
-                timerBox.classList.add('active', 'hiding');
-            } else if (timer.running && timer.phase === 'seeking') {
-                timerBox.classList.add('active', 'seeking');
-            } else {
-                timerBox.classList.add('inactive');
-            }
-        }
-        
-        async function fetchState() {
-            try {
-                const response = await fetch('/state');
-                currentState = await response.json();
-                renderPlayers();
-                updateTimers();
-            } catch (error) {
-                console.error('Error fetching state:', error);
-            }
-        }
-        
-        async function sendAction(action, data = {}) {
-            await fetch('/state', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({action, ...data})
-            });
-            setTimeout(fetchState, 100);
-        }
-        
-        function setSeeker(index) {
-            sendAction('set_seeker', {index});
-        }
-        
-        function addPoint(index) {
-            sendAction('add_point', {index});
-        }
-        
-        function playerFound(index) {
-            sendAction('player_found', {index});
+    <script src="/static/clock.js?v={clock_version}"></script>
+    <script src="/static/control.js?v={js_version}"></script>
+</body>
+</html>'''
+
+CONTROL_CSS = '''body {
+    font-family: Arial, sans-serif;
+    background: #1a1a1a;
+    color: #fff;
+    padding: 20px;
+    margin: 0;
+}
+h1 {
+    text-align: center;
+    color: #fff;
+}
+.section {
+    background: #2a2a2a;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 20px 0;
+}
+.timer-display {
+    display: flex;
+    justify-content: center;
+    margin: 20px 0;
+}
+.timer-box {
+    background: #3a3a3a;
+    border-radius: 10px;
+    padding: 20px 40px;
+    text-align: center;
+    min-width: 200px;
+}
+.timer-box.active {
+    border: 3px solid #4CAF50;
+    animation: pulse 1.5s infinite;
+}
+@keyframes pulse {
+    0%, 100% { border-color: #4CAF50; }
+    50% { border-color: #66ff66; }
+}
+.timer-label {
+    font-size: 14px;
+    color: #999;
+    margin-bottom: 10px;
+    text-transform: uppercase;
+    font-weight: bold;
+}
+.timer-time {
+    font-size: 42px;
+    font-weight: bold;
+    font-family: 'Courier New', monospace;
+}
+.timer-box.hiding .timer-time {
+    color: #ffff66;
+}
+.timer-box.seeking .timer-time {
+    color: #66ff66;
+}
+.timer-box.inactive .timer-time {
+    color: #666;
+}
+.player-card {
+    background: #3a3a3a;
+    border-radius: 8px;
+    padding: 15px;
+    margin: 10px 0;
+}
+.player-name {
+    font-size: 20px;
+    font-weight: bold;
+    margin-bottom: 10px;
+}
+.player-status {
+    display: inline-block;
+    padding: 3px 8px;
+    border-radius: 5px;
+    font-size: 12px;
+    font-weight: bold;
+    margin-left: 10px;
+}
+.status-found {
+    background: #ff9800;
+    color: white;
+}
+input[type="text"] {
+    width: 200px;
+    padding: 8px;
+    font-size: 16px;
+    border-radius: 5px;
+    border: none;
+    margin: 5px 0;
+}
+button {
+    background: #4CAF50;
+    color: white;
+    border: none;
+    padding: 12px 24px;
+    font-size: 16px;
+    border-radius: 8px;
+    margin: 5px;
+    cursor: pointer;
+    font-weight: bold;
+}
+button:active {
+    transform: scale(0.95);
+}
+.seeker-btn {
+    background: #ff9800;
+}
+.found-btn {
+    background: #2196F3;
+}
+.timer-btn {
+    background: #9C27B0;
+    width: 100%;
+    padding: 15px;
+    font-size: 18px;
+}
+.remove-btn {
+    background: #757575;
+}
+.reset-btn {
+    background: #f44336;
+    width: 100%;
+    padding: 15px;
+    font-size: 18px;
+}
+.btn-row {
+    display: flex;
+    gap: 10px;
+    flex-wrap: wrap;
+}
+'''
+
+CONTROL_JS = '''// Same page serves every room: /r/<room_id>/ prefixes the API routes
+const BASE = location.pathname.replace(/\\/$/, '');
+
+let currentState = null;
+
+function playerCard(player, i) {
+    const isSeeker = i === currentState.seeker_index;
+    const foundBadge = player.found ? '<span class="player-status status-found">&#x2713; FOUND</span>' : '';
+    const seekerBadge = isSeeker ? '<span class="player-status" style="background: #9C27B0; color: white;">&#x2605; SEEKER</span>' : '';
+
+    return `
+        <div class="player-card" style="border-left: 5px solid ${player.color}">
+            <div class="player-name" style="color: ${player.color}">
+                ${player.name} ${seekerBadge}${foundBadge}
+                <span style="float: right; color: white;">Score: ${player.score}</span>
+            </div>
+            <input type="text" id="name-${i}" value="${player.name}" 
+                   onchange="updateName(${i})" placeholder="Player name">
+            <div class="btn-row">
+                <button class="seeker-btn" onclick="setSeeker(${i})">Set as Seeker</button>
+                <button onclick="addPoint(${i})">+1 Point</button>
+                <button class="found-btn" onclick="playerFound(${i})">Found This Player</button>
+                <button class="remove-btn" onclick="removePlayer(${i})">Remove</button>
+            </div>
+        </div>
+    `;
+}
+
+function renderPlayers() {
+    if (!currentState) return;
+    const container = document.getElementById('players');
+    container.innerHTML = currentState.players.map(playerCard).join('');
+}
+
+function renderPlayer(i) {
+    // Replace just this player's card; with many players a full
+    // re-render per score change would be wasteful
+    const card = document.getElementById('players').children[i];
+    if (card) {
+        card.outerHTML = playerCard(currentState.players[i], i);
+    }
+}
+
+function updateTimers() {
+    if (!currentState || !currentState.timer) return;
+
+    const timer = currentState.timer;
+    const timerBox = document.getElementById('main-timer');
+    const timerLabel = document.getElementById('timer-label');
+    const timerTime = document.getElementById('timer-time');
+
+    timerLabel.textContent = timer.label || 'READY';
+    timerTime.textContent = timer.time || '--:--';
+
+    // Count down locally from the phase deadline; the server only
+    // sends the timer again when the phase changes
+    showCountdown(timer, timerTime, updateTimers);
+
+    timerBox.className = 'timer-box';
+
+    if (timer.running && timer.phase === 'hiding') {
+        timerBox.classList.add('active', 'hiding');
+    } else if (timer.running && timer.phase === 'seeking') {
+        timerBox.classList.add('active', 'seeking');
+    } else {
+        timerBox.classList.add('inactive');
+    }
+}
+
+let pollTimer = null;
+let eventsConnected = false;
+let eventSource = null;
+let socket = null;
+let socketOpen = false;
+let actionSeq = 0;
+
+function applyState(state) {
+    currentState = state;
+    renderPlayers();
+    updateTimers();
+}
+
+function applyDelta(delta) {
+    if (!currentState) return;
+    if (delta.players) {
+        currentState.players = delta.players;
+    }
+    if (delta.player_changes) {
+        for (const [i, fields] of Object.entries(delta.player_changes)) {
+            Object.assign(currentState.players[i], fields);
         }
-        
-        function resetScores() {
-            if(confirm('Reset all scores to 0?')) {
-                sendAction('reset_scores');
-            }
+    }
+    for (const key of ['version', 'seeker_index', 'timer_running', 'timer']) {
+        if (key in delta) currentState[key] = delta[key];
+    }
+    if (delta.players || 'seeker_index' in delta) {
+        renderPlayers();
+    } else if (delta.player_changes) {
+        for (const i of Object.keys(delta.player_changes)) {
+            renderPlayer(Number(i));
         }
-        
-        function startRound() {
-            sendAction('start_round');
+    }
+    updateTimers();
+}
+
+async function fetchState() {
+    try {
+        // Ask only for what changed since the version we hold
+        const url = BASE + (currentState
+            ? `/state?since=${currentState.version}&epoch=${currentState.epoch}`
+            : '/state');
+        const response = await fetch(url, {cache: 'no-store'});
+        if (response.status === 304) return;
+        const state = await response.json();
+        if ('since' in state) {
+            applyDelta(state);
+        } else {
+            applyState(state);
         }
-        
-        function stopTimer() {
-            sendAction('stop_timer');
+    } catch (error) {
+        console.error('Error fetching state:', error);
+    }
+}
+
+function startPolling() {
+    if (pollTimer === null) {
+        fetchState();
+        pollTimer = setInterval(fetchState, 500);
+    }
+}
+
+function stopPolling() {
+    if (pollTimer !== null) {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+}
+
+function connectEvents() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    const source = new EventSource(BASE + '/events');
+    eventSource = source;
+    source.onopen = () => {
+        eventsConnected = true;
+        stopPolling();
+    };
+    source.onmessage = (event) => applyState(JSON.parse(event.data));
+    source.onerror = () => {
+        // EventSource retries on its own; poll until it is back
+        eventsConnected = false;
+        startPolling();
+    };
+}
+
+function connectSocket() {
+    if (!window.WebSocket) {
+        connectEvents();
+        return;
+    }
+    const proto = location.protocol === 'https:' ? 'wss:' : 'ws:';
+    socket = new WebSocket(`${proto}//${location.host}${BASE}/ws`);
+    socket.onopen = () => {
+        socketOpen = true;
+        stopPolling();
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+            eventsConnected = false;
         }
-        
-        function updateName(index) {
-            const name = document.getElementById('name-' + index).value;
-            players[index].name = name;
-            sendAction('update_name', {index, name});
+    };
+    socket.onmessage = (event) => {
+        const msg = JSON.parse(event.data);
+        if (msg.type === 'state') {
+            applyState(msg.state);
+        } else if (msg.type === 'delta') {
+            applyDelta(msg);
+        } else if (msg.type === 'ack' && msg.status === 'error') {
+            console.error('Action ' + msg.seq + ' rejected:', msg.error);
         }
-        
+    };
+    socket.onclose = () => {
+        // Fall back to the event stream and keep trying to reconnect
+        socketOpen = false;
+        socket = null;
+        if (!eventSource) connectEvents();
+        setTimeout(connectSocket, 3000);
+    };
+}
+
+async function sendAction(action, data = {}) {
+    if (socketOpen) {
+        socket.send(JSON.stringify({action, ...data, seq: ++actionSeq}));
+        return;
+    }
+    const response = await fetch(BASE + '/state', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({action, ...data})
+    });
+    const result = await response.json();
+    // The reply says which state version the action produced
+    if (!eventsConnected && currentState && result.version > currentState.version) {
         fetchState();
-        setInterval(fetchState, 500);
-    </script>
+    }
+}
+
+function setSeeker(index) {
+    sendAction('set_seeker', {index});
+}
+
+function addPoint(index) {
+    sendAction('add_point', {index});
+}
+
+function playerFound(index) {
+    sendAction('player_found', {index});
+}
+
+function resetScores() {
+    if(confirm('Reset all scores to 0?')) {
+        sendAction('reset_scores');
+    }
+}
+
+function startRound() {
+    sendAction('start_round');
+}
+
+function stopTimer() {
+    sendAction('stop_timer');
+}
+
+function updateName(index) {
+    const name = document.getElementById('name-' + index).value;
+    sendAction('update_name', {index, name});
+}
+
+function addPlayer() {
+    sendAction('add_player');
+}
+
+function removePlayer(index) {
+    if (confirm('Remove ' + currentState.players[index].name + '?')) {
+        sendAction('remove_player', {index});
+    }
+}
+
+startPolling();
+connectSocket();
+startClock(BASE + '/time', updateTimers);
+'''
+
+
+
+# ------------- SPECTATOR PAGE -------------
+
+WATCH_PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <meta charset="UTF-8">
+    <title>Hide and Seek</title>
+    <link rel="stylesheet" href="/static/watch.css?v={css_version}">
+</head>
+<body>
+    <div id="board"></div>
+    <div class="timer-box" id="timer">
+        <div class="timer-title">GAME TIMER</div>
+        <div class="timer-label" id="timer-label">READY</div>
+        <div class="timer-time" id="timer-time">--:--</div>
+        <div class="timer-phase" id="timer-phase">Press START to begin</div>
+    </div>
+    <script src="/static/clock.js?v={clock_version}"></script>
+    <script src="/static/watch.js?v={js_version}"></script>
 </body>
 </html>'''
 
-        PORT = 8080
-        server = HTTPServer(('0.0.0.0', PORT), ControlHandler)
+WATCH_CSS = '''html, body {
+    height: 100%;
+    margin: 0;
+}
+body {
+    font-family: Arial, sans-serif;
+    font-weight: bold;
+    background: #1a1a1a;
+    color: #fff;
+}
+#board {
+    display: flex;
+    height: 100%;
+    box-sizing: border-box;
+    padding: 10px;
+    gap: 10px;
+}
+.column {
+    flex: 1;
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    justify-content: center;
+    text-align: center;
+    border: 3px outset rgba(255, 255, 255, 0.3);
+    border-radius: 4px;
+    min-width: 0;
+    overflow: hidden;
+}
+.column.seeker {
+    flex: 2;
+}
+.seeker-badge {
+    font-size: 2.5vmin;
+    margin: 1vmin;
+}
+.name {
+    font-size: 4.5vmin;
+    margin: 1.5vmin;
+    overflow-wrap: anywhere;
+}
+.found {
+    font-size: 2.8vmin;
+    color: #ffff00;
+    min-height: 3.5vmin;
+}
+.score {
+    font-size: 8vmin;
+    margin: 2vmin;
+}
+.seeker .score {
+    font-size: 10vmin;
+}
+.timer-box {
+    background: #2a2a2a;
+    border: 4px outset #444;
+    padding: 1.5vmin 3vmin;
+    margin: 2vmin;
+    text-align: center;
+}
+.timer-title {
+    font-size: 3vmin;
+    margin-bottom: 1vmin;
+}
+.timer-label, .timer-phase {
+    font-size: 2vmin;
+}
+.timer-time {
+    font-size: 8vmin;
+    font-family: 'Courier New', monospace;
+}
+.timer-box.hiding {
+    background: #4a2020;
+    color: #ff6666;
+}
+.timer-box.seeking {
+    background: #204a20;
+    color: #66ff66;
+}
+/* Many players: timer panel beside a grid of compact tiles */
+#board.compact .column {
+    flex: none;
+}
+#board.compact .tiles {
+    flex: 3;
+    display: grid;
+    gap: 6px;
+}
+#board.compact .panel {
+    flex: 1;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+}
+#board.compact .name {
+    font-size: 2.4vmin;
+    margin: 0.5vmin;
+}
+#board.compact .score {
+    font-size: 4vmin;
+    margin: 0.5vmin;
+}
+#board.compact .seeker-badge, #board.compact .found {
+    font-size: 1.6vmin;
+    min-height: 0;
+    margin: 0;
+}
+'''
 
-        ip = self.get_local_ip()
-        self.control_url = f"http://{ip}:{PORT}"
+WATCH_JS = '''// Read-only scoreboard. Every event is the full state, so a screen
+// that falls behind simply picks up at the newest one.
+const BASE = location.pathname.replace(/\\/watch\\/?$/, '');
+const WIDE_LAYOUT_MAX = {wide_layout_max};
 
-        print(f"\n{'='*50}")
-        print(f"Control Panel URL: {self.control_url}")
-        print(f"{'='*50}\n")
+let currentState = null;
+
+function element(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text) node.textContent = text;
+    return node;
+}
 
-        self.root.after(500, self.update_qr_code)
+function playerColumn(player, i) {
+    const isSeeker = i === currentState.seeker_index;
+    const column = element('div', isSeeker ? 'column seeker' : 'column');
+    column.style.background = player.color;
+    if (isSeeker) column.appendChild(element('div', 'seeker-badge', '\\u2605 SEEKER \\u2605'));
+    column.appendChild(element('div', 'name', player.name));
+    column.appendChild(element('div', 'found', player.found ? '\\u2713 FOUND' : ''));
+    column.appendChild(element('div', 'score', String(player.score)));
+    return column;
+}
 
-        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
-        server_thread.start()
+function renderBoard() {
+    const board = document.getElementById('board');
+    const timer = document.getElementById('timer');
+    const players = currentState.players;
+    const columns = players.map(playerColumn);
+    board.replaceChildren();
+
+    if (players.length <= WIDE_LAYOUT_MAX) {
+        // As on the display: the timer sits in the seeker's column
+        board.className = '';
+        board.append(...columns);
+        (columns[currentState.seeker_index] || board).appendChild(timer);
+        return;
+    }
+    board.className = 'compact';
+    const panel = element('div', 'panel');
+    panel.appendChild(timer);
+    const tiles = element('div', 'tiles');
+    const perRow = Math.max(1, Math.ceil(Math.sqrt(players.length * 4 / 3)));
+    tiles.style.gridTemplateColumns = `repeat(${perRow}, 1fr)`;
+    tiles.append(...columns);
+    board.append(panel, tiles);
+}
+
+function renderTimer() {
+    if (!currentState) return;
+    const timer = currentState.timer;
+    const phases = {hiding: 'HIDING...', seeking: 'ROUND IN PROGRESS'};
+
+    document.getElementById('timer').className = 'timer-box ' + (timer.phase || '');
+    document.getElementById('timer-label').textContent = timer.label || 'READY';
+    document.getElementById('timer-phase').textContent = phases[timer.phase] || 'Press START to begin';
+    const timeLabel = document.getElementById('timer-time');
+    timeLabel.textContent = timer.time || '--:--';
+
+    showCountdown(timer, timeLabel, renderTimer);
+}
+
+function connect() {
+    const source = new EventSource(BASE + '/watch/events');
+    source.onmessage = (event) => {
+        currentState = JSON.parse(event.data);
+        renderBoard();
+        renderTimer();
+    };
+    // EventSource reconnects on its own and gets the current state back
+}
+
+connect();
+startClock(BASE + '/time', renderTimer);
+'''
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = HideAndSeekApp(root)
-    root.mainloop()
+    startup = StartupTimer()
+    parser = argparse.ArgumentParser(description="Hide And Seek game display")
+    parser.add_argument("--canvas", action="store_true",
+                        help="draw the scoreboard on a single Canvas (faster on large displays)")
+    parser.add_argument("--sound", choices=["auto", "winsound", "wav", "none"], default="auto",
+                        help="sound backend (default: auto)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"control server port (default: {DEFAULT_PORT})")
+    parser.add_argument("--headless", action="store_true",
+                        help="serve game rooms without a display window")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR,
+                        help=f"where games are journaled for crash recovery (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="keep games in memory only")
+    parser.add_argument("--max-connections", type=int, default=HTTP_MAX_CONNECTIONS,
+                        help="open phone and spectator connections the control server accepts, "
+                             "roughly rooms x (phones + spectators) per room; past it new ones get "
+                             f"a 503 (default: {HTTP_MAX_CONNECTIONS})")
+    args = parser.parse_args()
+    data_dir = None if args.no_journal else args.data_dir
+
+    if args.headless:
+        run_headless(args.port, data_dir, startup, args.max_connections)
+    else:
+        root = tk.Tk()
+        startup.mark("window")
+        app = HideAndSeekApp(
+            root,
+            renderer="canvas" if args.canvas else "widgets",
+            sound_backend=create_sound_backend(args.sound),
+            port=args.port,
+            data_dir=data_dir,
+            startup=startup,
+            max_connections=args.max_connections
+        )
+        root.mainloop()
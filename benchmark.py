@@ -0,0 +1,184 @@
+"""
+Load test for the control server.
+
+Starts the server headlessly on localhost (or targets one given with
+--url) and runs N simulated controllers with the control page's own
+traffic pattern: load the page and its assets once, poll /state every
+500 ms with ?since=, and now and then POST a random action. Prints
+throughput and p50/p95/p99 latency per route.
+
+    python benchmark.py --clients 50 --duration 20
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+ACTIONS = [
+    lambda: {'action': 'add_point', 'index': random.randrange(3)},
+    lambda: {'action': 'player_found', 'index': random.randrange(3)},
+    lambda: {'action': 'set_seeker', 'index': random.randrange(3)},
+    lambda: {'action': 'update_name', 'index': random.randrange(3),
+             'name': f"Player {random.randrange(100)}"},
+]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class RouteStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}     # route -> [seconds]
+        self.errors = {}        # route -> count
+
+    def add(self, route, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, elapsed):
+        rows = []
+        for route in sorted(self.latencies):
+            values = sorted(self.latencies[route])
+            rows.append({
+                'route': route,
+                'requests': len(values),
+                'errors': self.errors.get(route, 0),
+                'rps': len(values) / elapsed,
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+            })
+        return rows
+
+
+class Controller:
+    """One simulated phone running the control page."""
+
+    def __init__(self, host, port, base, stats, args, stop):
+        self.conn = http.client.HTTPConnection(host, port, timeout=10)
+        self.base = base
+        self.stats = stats
+        self.args = args
+        self.stop = stop
+        self.version = None
+        self.epoch = None
+
+    def request(self, method, path, route, body=None):
+        headers = {'Accept-Encoding': 'gzip'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        start = time.perf_counter()
+        try:
+            self.conn.request(method, self.base + path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            if response.getheader('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            if response.will_close:
+                self.conn.close()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.stats.add(route, time.perf_counter() - start, False)
+            return None, None
+        self.stats.add(route, time.perf_counter() - start, ok)
+        return response.status, data
+
+    def run(self):
+        # Page load
+        status, page = self.request('GET', '/', 'GET /')
+        for asset in re.findall(rb'(?:href|src)="(/static/[^"]+)"', page or b''):
+            self.request('GET', asset.decode(), 'GET /static')
+
+        next_poll = next_action = time.monotonic()
+        next_action += random.expovariate(1 / self.args.action_interval)
+        while not self.stop.is_set():
+            now = time.monotonic()
+            if now >= next_action:
+                body = json.dumps(random.choice(ACTIONS)()).encode()
+                self.request('POST', '/state', 'POST /state', body)
+                next_action = now + random.expovariate(1 / self.args.action_interval)
+            if now >= next_poll:
+                self.poll()
+                next_poll += self.args.poll_interval
+            self.stop.wait(max(0.0, min(next_poll, next_action) - time.monotonic()))
+
+    def poll(self):
+        path = '/state' if self.version is None else f'/state?since={self.version}&epoch={self.epoch}'
+        status, data = self.request('GET', path, 'GET /state')
+        if status == 200:
+            state = json.loads(data)
+            self.version, self.epoch = state['version'], state['epoch']
+
+
+def start_local_server():
+    import Main
+    rooms = Main.RoomRegistry()
+    server = Main.start_control_server(rooms, 0)
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Hide And Seek control server")
+    parser.add_argument("--clients", type=int, default=20, help="simulated controllers (default: 20)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run (default: 10)")
+    parser.add_argument("--poll-interval", type=float, default=0.5,
+                        help="seconds between /state polls per client (default: 0.5)")
+    parser.add_argument("--action-interval", type=float, default=5.0,
+                        help="mean seconds between actions per client (default: 5)")
+    parser.add_argument("--rooms", type=int, default=1,
+                        help="spread clients over this many rooms (default: 1)")
+    parser.add_argument("--url", help="benchmark a running server instead of starting one")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    url = args.url or start_local_server()[1]
+    parts = urlsplit(url)
+    stats = RouteStats()
+    stop = threading.Event()
+
+    clients = []
+    for i in range(args.clients):
+        room = i % args.rooms
+        base = parts.path.rstrip('/') + (f"/r/bench{room}" if args.rooms > 1 else "")
+        clients.append(Controller(parts.hostname, parts.port or 80, base, stats, args, stop))
+
+    threads = [threading.Thread(target=c.run, daemon=True) for c in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=15)
+    elapsed = time.perf_counter() - start
+
+    rows = stats.report(elapsed)
+    if args.json:
+        print(json.dumps({'clients': args.clients, 'duration': elapsed, 'routes': rows}, indent=2))
+        return
+
+    print(f"{args.clients} clients, {elapsed:.1f}s against {url}")
+    print(f"{'route':<14}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for row in rows:
+        print(f"{row['route']:<14}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10.1f}"
+              f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+    total = sum(row['requests'] for row in rows)
+    print(f"{'total':<14}{total:>10}{sum(row['errors'] for row in rows):>8}{total / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,650 @@
+"""
+Tests for the game rules and the control server. The engine runs on an
+injected clock, so no test waits for a real minute to pass.
+
+    python -m unittest test_main
+"""
+
+import http.client
+import json
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import Main
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def recording(engine):
+    """Subscribe to `engine` and return the list its events land in."""
+    events = []
+    engine.subscribe(lambda event, data: events.append((event, data)))
+    return events
+
+
+class TimerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.engine = Main.GameEngine(clock=self.clock)
+        self.events = recording(self.engine)
+
+    def names(self, event):
+        return [data for name, data in self.events if name == event]
+
+    def test_late_tick_awards_each_missed_minute_once(self):
+        self.engine.start_round()
+        self.clock.now = Main.HIDING_SECONDS + 3 * 60 + 30
+        self.engine.tick()
+        self.assertEqual([d["minute"] for d in self.names("minute")], [1, 2, 3])
+        self.assertEqual([p["score"] for p in self.engine.players], [0, 3, 3])
+
+        self.engine.tick()
+        self.assertEqual(len(self.names("minute")), 3)
+
+    def test_seeking_starts_at_the_hiding_deadline(self):
+        self.engine.start_round()
+        self.clock.now = Main.HIDING_SECONDS + 12.5
+        self.engine.tick()
+        self.assertEqual(self.engine.timer_phase, "seeking")
+        self.assertEqual(self.engine.phase_start_time, Main.HIDING_SECONDS)
+
+    def test_round_completes_after_downtime(self):
+        self.engine.start_round()
+        self.clock.now = Main.HIDING_SECONDS + Main.SEEKING_SECONDS + 100
+        self.engine.tick()
+        self.assertFalse(self.engine.timer_running)
+        self.assertEqual(len(self.names("minute")), Main.SEEKING_SECONDS // 60)
+        [finished] = self.names("round_finished")
+        self.assertEqual(finished["record"]["outcome"], "complete")
+
+    def test_warnings_fire_once_per_second(self):
+        self.engine.start_round()
+        for now in (54.0, 55.2, 55.7, 56.1, 57.3, 57.9, 58.5, 59.99):
+            self.clock.now = now
+            self.engine.tick()
+        self.assertEqual([d["remaining"] for d in self.names("warning")], [5, 4, 3, 2, 1])
+
+    def test_countdown_does_not_bump_the_state_version(self):
+        self.engine.start_round()
+        version = self.engine.state_version
+        for now in range(1, 10):
+            self.clock.now = now
+            self.engine.tick()
+        self.assertEqual(self.engine.state_version, version)
+        self.assertEqual(len(self.names("timer")), 10)
+
+
+class RosterTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Main.GameEngine(clock=FakeClock())
+
+    def test_removing_a_player_shifts_the_seeker_down(self):
+        self.engine.add_player("D")
+        self.engine.set_seeker(2)
+        self.engine.remove_player(0)
+        self.assertEqual(self.engine.seeker_index, 1)
+        self.assertEqual([p["name"] for p in self.engine.players], ["Player 2", "Player 3", "D"])
+
+    def test_removing_the_last_seeker_moves_the_role_back(self):
+        self.engine.set_seeker(2)
+        self.engine.remove_player(2)
+        self.assertEqual(self.engine.seeker_index, 1)
+
+    def test_first_found_follows_index_shifts(self):
+        self.engine.add_player()
+        self.engine.start_round()
+        self.engine.mark_player_found(3)
+        self.engine.remove_player(1)
+        self.assertEqual(self.engine.first_found_index, 2)
+
+    def test_roster_change_sends_all_players_in_deltas(self):
+        version = self.engine.state_version
+        self.engine.remove_player(1)
+        delta = self.engine.get_state_since(version)
+        self.assertEqual(len(delta["players"]), 2)
+        self.assertNotIn("player_changes", delta)
+
+
+class ActionsTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = Main.GameEngine(clock=FakeClock())
+
+    def test_batch_is_validated_before_anything_is_applied(self):
+        version = self.engine.state_version
+        with self.assertRaisesRegex(ValueError, "action 1"):
+            self.engine.apply_actions([
+                {"action": "add_point", "index": 0},
+                {"action": "add_point", "index": 7},
+            ])
+        self.assertEqual(self.engine.state_version, version)
+        self.assertEqual(self.engine.players[0]["score"], 0)
+
+    def test_batch_can_name_players_it_adds(self):
+        self.engine.apply_actions([
+            {"action": "add_player"},
+            {"action": "add_point", "index": 3},
+        ])
+        self.assertEqual(self.engine.players[3]["score"], 1)
+
+    def test_batch_tracks_removals(self):
+        with self.assertRaises(ValueError):
+            self.engine.apply_actions([
+                {"action": "remove_player", "index": 0},
+                {"action": "add_point", "index": 2},
+            ])
+
+    def test_rejects_non_integer_indices(self):
+        for index in (True, False, "1", 1.0, None, -1, 3):
+            with self.assertRaises(ValueError, msg=repr(index)):
+                self.engine.apply_action({"action": "add_point", "index": index})
+
+    def test_rejects_unknown_actions(self):
+        with self.assertRaises(ValueError):
+            self.engine.apply_action({"action": "explode"})
+
+
+def client_frame(opcode, payload, fin=True, wide=False):
+    """A masked client-to-server frame; `wide` forces the 8-byte length form."""
+    first = (0x80 if fin else 0) | opcode
+    length = len(payload)
+    if wide:
+        header = struct.pack("!BBQ", first, 0x80 | 127, length)
+    elif length < 126:
+        header = struct.pack("!BB", first, 0x80 | length)
+    else:
+        header = struct.pack("!BBH", first, 0x80 | 126, length)
+    mask = os.urandom(4)
+    return header + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+class WebSocketTest(unittest.TestCase):
+    def setUp(self):
+        server, self.peer = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(self.peer.close)
+        self.ws = Main.WebSocket(server)
+        self.peer.settimeout(5)
+
+    def test_masked_frames_of_every_length_form(self):
+        for payload, wide in ((b"hi", False), (b"x" * 300, False), (b"y" * 70, True)):
+            self.peer.sendall(client_frame(Main.WS_OP_TEXT, payload, wide=wide))
+            self.assertEqual(self.ws._read_frame(), (True, Main.WS_OP_TEXT, payload))
+
+    def test_partial_frame_is_kept_across_a_timeout(self):
+        frame = client_frame(Main.WS_OP_TEXT, b"x" * 300)
+        self.peer.sendall(frame[:100])
+        self.ws.sock.settimeout(0.05)
+        with self.assertRaises(socket.timeout):
+            self.ws._read_frame()
+        self.peer.sendall(frame[100:])
+        self.assertEqual(self.ws._read_frame(), (True, Main.WS_OP_TEXT, b"x" * 300))
+
+    def test_rejects_unmasked_frames(self):
+        self.peer.sendall(Main.encode_ws_frame(Main.WS_OP_TEXT, b"hi"))
+        with self.assertRaisesRegex(ValueError, "masked"):
+            self.ws._read_frame()
+
+    def test_rejects_too_large_frames_from_the_header(self):
+        self.peer.sendall(struct.pack("!BBQ", 0x81, 0xFF, Main.WS_MAX_MESSAGE + 1))
+        with self.assertRaisesRegex(ValueError, "too large"):
+            self.ws._read_frame()
+
+    def test_receive_joins_fragments_and_answers_pings(self):
+        self.peer.sendall(
+            client_frame(Main.WS_OP_TEXT, b"hel", fin=False)
+            + client_frame(Main.WS_OP_PING, b"beat")
+            + client_frame(Main.WS_OP_CONTINUATION, b"lo")
+        )
+        self.assertEqual(self.ws.receive(), "hello")
+        self.assertEqual(self.peer.recv(64), Main.encode_ws_frame(Main.WS_OP_PONG, b"beat"))
+
+    def test_receive_rejects_too_large_fragmented_messages(self):
+        half = b"z" * (Main.WS_MAX_MESSAGE // 2 + 1)
+        self.peer.sendall(
+            client_frame(Main.WS_OP_TEXT, half, fin=False)
+            + client_frame(Main.WS_OP_CONTINUATION, half)
+        )
+        with self.assertRaisesRegex(ValueError, "too large"):
+            self.ws.receive()
+
+    def test_receive_echoes_close(self):
+        self.peer.sendall(client_frame(Main.WS_OP_CLOSE, b"\x03\xe8bye"))
+        self.assertIsNone(self.ws.receive())
+        self.assertEqual(self.peer.recv(64), Main.encode_ws_frame(Main.WS_OP_CLOSE, b"\x03\xe8"))
+
+
+class SpectatorTest(unittest.TestCase):
+    def setUp(self):
+        server, self.peer = socket.socketpair()
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        self.peer.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        self.addCleanup(self.peer.close)
+        self.spectator = Main.Spectator(server)
+        self.addCleanup(self.spectator.close)
+        self.now = time.monotonic()
+
+    def counted(self, counter, *labels):
+        return counter.values.get(labels, 0)
+
+    def read_all(self):
+        """Drain the peer while flushing until the spectator is caught up."""
+        self.peer.settimeout(0.2)
+        received = bytearray()
+        while True:
+            self.assertTrue(self.spectator.flush(self.now))
+            try:
+                chunk = self.peer.recv(65536)
+            except socket.timeout:
+                break
+            received += chunk
+        self.assertFalse(self.spectator.backlogged)
+        return bytes(received)
+
+    def test_backed_up_spectator_only_gets_the_newest_frame(self):
+        skipped = self.counted(Main.SPECTATOR_FRAMES, "skipped")
+        first = b"a" * 1024 * 1024
+        self.spectator.push(first)
+        self.assertTrue(self.spectator.flush(self.now))
+        self.assertTrue(self.spectator.backlogged)
+
+        self.spectator.push(b"b" * 100)
+        self.spectator.push(b"c" * 100)
+        self.assertEqual(self.counted(Main.SPECTATOR_FRAMES, "skipped"), skipped + 1)
+        self.assertEqual(self.read_all(), first + b"c" * 100)
+
+    def test_spectator_is_dropped_after_max_lag_without_progress(self):
+        drops = self.counted(Main.SPECTATOR_DROPS)
+        self.spectator.push(b"a" * 1024 * 1024)
+        self.assertTrue(self.spectator.flush(self.now))
+        self.assertTrue(self.spectator.flush(self.now + Main.SPECTATOR_MAX_LAG / 2))
+        self.assertFalse(self.spectator.flush(self.now + Main.SPECTATOR_MAX_LAG + 1))
+        self.assertEqual(self.counted(Main.SPECTATOR_DROPS), drops + 1)
+
+
+class StateDeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.engine = Main.GameEngine(clock=self.clock)
+        self.before = self.engine.get_state()
+
+    def delta(self):
+        return Main.state_delta(self.before, self.engine.get_state())
+
+    def test_unchanged_state_has_no_delta(self):
+        self.assertEqual(self.delta(), {})
+
+    def test_only_changed_player_fields_are_sent(self):
+        self.engine.apply_action({"action": "add_point", "index": 2})
+        self.assertEqual(self.delta(), {
+            "player_changes": {"2": {"score": 1}},
+            "version": self.engine.state_version,
+        })
+
+    def test_roster_change_sends_every_player(self):
+        self.engine.apply_action({"action": "add_player"})
+        delta = self.delta()
+        self.assertEqual(len(delta["players"]), 4)
+        self.assertNotIn("player_changes", delta)
+
+    def test_seeker_and_timer_changes(self):
+        self.engine.apply_action({"action": "set_seeker", "index": 1})
+        self.engine.apply_action({"action": "start_round"})
+        delta = self.delta()
+        self.assertEqual(delta["seeker_index"], 1)
+        self.assertTrue(delta["timer_running"])
+        self.assertEqual(delta["timer"], self.engine.get_state()["timer"])
+
+
+class CommandQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = Main.CommandQueue(lambda: None)
+
+    def test_timed_out_command_is_never_applied(self):
+        applied = []
+        with self.assertRaises(TimeoutError):
+            self.queue.call(lambda: applied.append(1), 0.01)
+        self.queue.drain()
+        self.assertEqual(applied, [])
+
+    def test_command_taken_by_drain_is_reported_queued(self):
+        release = threading.Event()
+        outcome = []
+
+        def caller():
+            try:
+                outcome.append(self.queue.call(lambda: release.wait(5), 0.2))
+            except Main.CommandQueued:
+                outcome.append("queued")
+
+        thread = threading.Thread(target=caller)
+        thread.start()
+        while not len(self.queue):
+            time.sleep(0.001)
+        drainer = threading.Thread(target=self.queue.drain)
+        drainer.start()
+        thread.join()
+        release.set()
+        drainer.join()
+        self.assertEqual(outcome, ["queued"])
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.clock = FakeClock()
+
+    def open_engine(self, clock=None):
+        engine = Main.GameEngine(clock=clock or self.clock)
+        journal = Main.GameJournal(self.directory)
+        journal.attach(engine)
+        self.addCleanup(journal.close)
+        return engine, journal
+
+    def test_recovers_scores_roster_and_running_round(self):
+        engine, journal = self.open_engine()
+        engine.apply_action({"action": "add_player"})
+        engine.apply_action({"action": "update_name", "index": 3, "name": "Dana"})
+        engine.apply_action({"action": "add_point", "index": 0})
+        engine.apply_action({"action": "start_round"})
+        self.clock.now = Main.HIDING_SECONDS + 61
+        engine.tick()
+        journal.close()
+
+        recovered, _ = self.open_engine()
+        self.assertEqual(recovered.players, engine.players)
+        self.assertTrue(recovered.timer_running)
+        self.assertEqual(recovered.timer_phase, "seeking")
+
+    def test_replayed_actions_are_not_counted_again(self):
+        engine, journal = self.open_engine()
+        engine.apply_action({"action": "add_player"})
+        engine.apply_actions([{"action": "add_point", "index": 0}, {"action": "add_point", "index": 1}])
+        journal.close()
+
+        counts = dict(Main.ACTIONS_APPLIED.values)
+        recovered, _ = self.open_engine()
+        self.assertEqual([p["score"] for p in recovered.players], [1, 1, 0, 0])
+        self.assertEqual(Main.ACTIONS_APPLIED.values, counts)
+        self.assertFalse(recovered.replaying)
+
+    def test_recovered_round_catches_up_after_subscribing(self):
+        engine, journal = self.open_engine()
+        engine.apply_action({"action": "start_round"})
+        journal.close()
+
+        # Restart with a fresh monotonic clock after the round's whole length
+        downtime = Main.HIDING_SECONDS + Main.SEEKING_SECONDS + 5
+        wall = time.time()
+        with mock.patch.object(Main.time, "time", lambda: wall + downtime):
+            recovered, _ = self.open_engine(FakeClock())
+        self.assertTrue(recovered.timer_running)
+        events = recording(recovered)
+        recovered.tick()
+        self.assertIn("round_finished", [name for name, _ in events])
+        self.assertEqual([p["score"] for p in recovered.players], [0, 5, 5])
+
+
+def round_record(outcome, *players, seeker="Sam"):
+    """A round_finished record; each player is (name, role, points, found_after)."""
+    return {
+        "duration": 300.0, "outcome": outcome, "seeker": seeker,
+        "players": [
+            {"name": name, "role": role, "points": points, "minute_points": points,
+             "found_after": found_after}
+            for name, role, points, found_after in players
+        ],
+    }
+
+
+class RoundHistoryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.history = Main.RoundHistory(f"{directory}/history.db")
+        self.addCleanup(self.history.db.close)
+
+    def store(self, ended_at, record, room="main"):
+        self.history.store(room, ended_at, record)
+
+    def test_totals_accumulate_across_rounds(self):
+        self.store(1.0, round_record("complete", ("Sam", "seeker", 0, None), ("Ann", "hider", 4, 120.0)))
+        self.store(2.0, round_record("ended", ("Sam", "hider", 2, 60.0), ("Ann", "hider", 6, None)))
+        ann = self.history.player("main", "Ann")
+        self.assertEqual((ann["rounds"], ann["points"], ann["times_found"]), (2, 10, 1))
+        self.assertEqual(ann["avg_points"], 5.0)
+        self.assertEqual(ann["avg_found_after"], 120.0)
+        sam = self.history.player("main", "Sam")
+        self.assertEqual((sam["rounds"], sam["seeker_rounds"]), (2, 1))
+
+    def test_stopped_rounds_are_kept_out_of_the_totals(self):
+        self.store(1.0, round_record("complete", ("Ann", "hider", 4, None)))
+        self.store(2.0, round_record("stopped", ("Ann", "hider", 9, None)))
+        self.assertEqual(self.history.leaderboard("main")[0]["points"], 4)
+        self.assertEqual(len(self.history.player("main", "Ann")["recent_rounds"]), 2)
+
+    def test_player_with_only_stopped_rounds_has_zero_totals(self):
+        self.store(1.0, round_record("stopped", ("Ann", "hider", 3, None)))
+        ann = self.history.player("main", "Ann")
+        self.assertEqual((ann["rounds"], ann["points"], ann["avg_points"]), (0, 0, None))
+        self.assertEqual([r["points"] for r in ann["recent_rounds"]], [3])
+        self.assertIsNone(self.history.player("main", "Nobody"))
+
+    def test_leaderboard_orders_by_points_within_the_room(self):
+        self.store(1.0, round_record("complete", ("Ann", "hider", 4, None), ("Bo", "hider", 7, None)))
+        self.store(2.0, round_record("complete", ("Cy", "hider", 99, None)), room="other")
+        self.assertEqual([p["player"] for p in self.history.leaderboard("main")], ["Bo", "Ann"])
+        self.assertEqual([p["player"] for p in self.history.leaderboard("main", limit=1)], ["Bo"])
+
+    def test_recent_rounds_are_newest_first_with_their_players(self):
+        self.store(1.0, round_record("complete", ("Ann", "hider", 4, None), seeker="Bo"))
+        self.store(2.0, round_record("stopped", ("Bo", "hider", 1, None), ("Ann", "seeker", 0, None)))
+        rounds = self.history.recent_rounds("main")
+        self.assertEqual([r["outcome"] for r in rounds], ["stopped", "complete"])
+        self.assertEqual({p["player"] for p in rounds[0]["players"]}, {"Bo", "Ann"})
+        self.assertEqual(rounds[1]["seeker"], "Bo")
+        self.assertEqual(self.history.recent_rounds("other"), [])
+
+
+class RoomRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.rooms = Main.RoomRegistry(max_rooms=3, data_dir=self.directory)
+        self.addCleanup(self.close_rooms)
+
+    def close_rooms(self):
+        for room in self.rooms.rooms.values():
+            room.close()
+
+    def visit(self, room_id):
+        """Create (or revive) a room the way loading its page does, then let go of it."""
+        room = self.rooms.get(room_id, True)
+        if room is not None:
+            self.rooms.release(room)
+        return room
+
+    def test_full_server_evicts_the_least_recently_used_room(self):
+        self.visit("a")
+        self.visit("b")
+        self.visit("a")
+        self.visit("c")
+        self.assertEqual(sorted(self.rooms.rooms), ["a", "c", "main"])
+
+    def test_leased_and_running_rooms_are_not_evicted(self):
+        leased = self.rooms.get("a", True)
+        self.visit("b").engine.start_round()
+        self.assertIsNone(self.visit("c"))
+        self.assertEqual(sorted(self.rooms.rooms), ["a", "b", "main"])
+
+        self.rooms.release(leased)
+        self.assertIsNotNone(self.visit("c"))
+        self.assertEqual(sorted(self.rooms.rooms), ["b", "c", "main"])
+
+    def test_rooms_idle_past_the_ttl_are_evicted(self):
+        self.visit("a")
+        with mock.patch.object(Main, "ROOM_IDLE_TTL", 0.0):
+            self.visit("b")
+        self.assertEqual(sorted(self.rooms.rooms), ["b", "main"])
+
+    def test_only_journaled_rooms_come_back_uncreated(self):
+        self.assertIsNone(self.rooms.get("ghost"))
+        self.visit("a").submit_action({"action": "add_point", "index": 0})
+        self.visit("b")
+        self.visit("c")
+        self.assertNotIn("a", self.rooms.rooms)
+
+        revived = self.rooms.get("a")
+        self.rooms.release(revived)
+        self.assertEqual(revived.engine.players[0]["score"], 1)
+        self.assertIsNone(self.rooms.get("ghost"))
+        self.assertIsNone(self.rooms.get("../etc", True))
+
+
+class RoomRouteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rooms = Main.RoomRegistry(max_rooms=3)
+        cls.server = Main.start_control_server(cls.rooms, 0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def request(self, method, path, body=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        self.addCleanup(conn.close)
+        conn.request(method, path, body=body)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+
+    def test_polls_and_assets_do_not_create_rooms(self):
+        for path in ("/r/poll/state", "/r/poll/events", "/r/poll/static/control.js"):
+            self.assertEqual(self.request("GET", path), 404, path)
+        self.assertNotIn("poll", self.rooms.rooms)
+
+    def test_page_load_and_post_create_rooms(self):
+        self.assertEqual(self.request("GET", "/r/page/"), 200)
+        self.assertEqual(self.request("POST", "/r/post/state", b'{"action": "add_point", "index": 0}'), 200)
+        self.assertEqual(self.rooms.rooms["post"].engine.players[0]["score"], 1)
+        self.assertEqual(self.request("GET", "/r/page/state"), 200)
+        self.assertEqual(self.rooms.rooms["page"].leases, 0)
+
+
+class StateRouteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rooms = Main.RoomRegistry()
+        cls.server = Main.start_control_server(cls.rooms, 0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.engine = self.rooms.default.engine
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        self.addCleanup(self.conn.close)
+
+    def get(self, path, headers=None):
+        self.conn.request("GET", path, headers=headers or {})
+        response = self.conn.getresponse()
+        body = response.read()
+        if response.getheader("Content-Type") != "application/json":
+            return response, None
+        return response, json.loads(body)
+
+    def post_with_length(self, length):
+        """POST /state with a Content-Length header (or none) and no body."""
+        self.conn.putrequest("POST", "/state")
+        if length is not None:
+            self.conn.putheader("Content-Length", length)
+        self.conn.endheaders()
+        response = self.conn.getresponse()
+        response.read()
+        return response.status
+
+    def test_post_needs_a_content_length(self):
+        self.assertEqual(self.post_with_length(None), 411)
+
+    def test_negative_content_length_is_a_400(self):
+        self.assertEqual(self.post_with_length("-1"), 400)
+
+    def test_body_over_the_limit_is_a_413(self):
+        self.assertEqual(self.post_with_length(str(Main.HTTP_MAX_BODY + 1)), 413)
+
+    def test_connection_is_kept_alive_after_a_post(self):
+        body = json.dumps({"action": "add_point", "index": 0})
+        self.conn.request("POST", "/state", body, {"Content-Type": "application/json"})
+        response = self.conn.getresponse()
+        self.assertEqual(json.loads(response.read())["status"], "ok")
+        sock = self.conn.sock
+        self.assertIsNotNone(sock)
+
+        response, state = self.get("/state")
+        self.assertEqual(response.status, 200)
+        self.assertIs(self.conn.sock, sock)
+        self.assertEqual(state["version"], self.engine.state_version)
+
+    def test_etag_answers_304_until_the_state_changes(self):
+        response, state = self.get("/state")
+        etag = response.getheader("ETag")
+        response, _ = self.get("/state", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+
+        self.rooms.default.submit_action({"action": "add_point", "index": 0})
+        response, _ = self.get("/state", {"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+
+    def test_since_returns_only_what_changed(self):
+        _, state = self.get("/state")
+        query = f"/state?since={state['version']}&epoch={state['epoch']}"
+        response, _ = self.get(query)
+        self.assertEqual(response.status, 304)
+
+        self.rooms.default.submit_action({"action": "add_point", "index": 1})
+        response, delta = self.get(query)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(delta["since"], state["version"])
+        self.assertEqual(list(delta["player_changes"]), ["1"])
+
+    def test_since_from_another_epoch_gets_the_full_state(self):
+        _, state = self.get("/state")
+        response, body = self.get(f"/state?since={state['version']}&epoch=00000000")
+        self.assertEqual(response.status, 200)
+        self.assertNotIn("since", body)
+        self.assertEqual(len(body["players"]), len(self.engine.players))
+
+    def test_both_pages_load_the_same_hashed_clock_script(self):
+        clock = self.server.static_assets["/static/clock.js"]
+        for page in ("/", "/watch"):
+            self.conn.request("GET", page)
+            body = self.conn.getresponse().read().decode()
+            self.assertIn(f'src="/static/clock.js?v={clock.version}"', body)
+        response, _ = self.get(f"/static/clock.js?v={clock.version}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("ETag"), clock.etag)
+
+    def test_bad_since_is_a_400(self):
+        response, _ = self.get("/state?since=soon")
+        self.assertEqual(response.status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()